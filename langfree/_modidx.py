@@ -5,7 +5,31 @@ d = { 'settings': { 'branch': 'main',
                 'doc_host': 'https://parlance-labs.github.io',
                 'git_url': 'https://github.com/parlance-labs/langfree',
                 'lib_path': 'langfree'},
-  'syms': { 'langfree.chatrecord': { 'langfree.chatrecord.ChatRecord': ('chatrecord.html#chatrecord', 'langfree/chatrecord.py'),
+  'syms': { 'langfree.cache': { 'langfree.cache.CommitRollup': ('cache.html#commitrollup', 'langfree/cache.py'),
+                                'langfree.cache.CommitRollup.__init__': ('cache.html#commitrollup.__init__', 'langfree/cache.py'),
+                                'langfree.cache.CommitRollup.__repr__': ('cache.html#commitrollup.__repr__', 'langfree/cache.py'),
+                                'langfree.cache.CommitRollup.add': ('cache.html#commitrollup.add', 'langfree/cache.py'),
+                                'langfree.cache.CommitRollup.clear': ('cache.html#commitrollup.clear', 'langfree/cache.py'),
+                                'langfree.cache.CommitRollup.counts': ('cache.html#commitrollup.counts', 'langfree/cache.py'),
+                                'langfree.cache.CommitRollup.missing': ('cache.html#commitrollup.missing', 'langfree/cache.py'),
+                                'langfree.cache.RunCache': ('cache.html#runcache', 'langfree/cache.py'),
+                                'langfree.cache.RunCache.__contains__': ('cache.html#runcache.__contains__', 'langfree/cache.py'),
+                                'langfree.cache.RunCache.__init__': ('cache.html#runcache.__init__', 'langfree/cache.py'),
+                                'langfree.cache.RunCache.__len__': ('cache.html#runcache.__len__', 'langfree/cache.py'),
+                                'langfree.cache.RunCache.__repr__': ('cache.html#runcache.__repr__', 'langfree/cache.py'),
+                                'langfree.cache.RunCache._evict': ('cache.html#runcache._evict', 'langfree/cache.py'),
+                                'langfree.cache.RunCache.clear': ('cache.html#runcache.clear', 'langfree/cache.py'),
+                                'langfree.cache.RunCache.delete': ('cache.html#runcache.delete', 'langfree/cache.py'),
+                                'langfree.cache.RunCache.get': ('cache.html#runcache.get', 'langfree/cache.py'),
+                                'langfree.cache.RunCache.set': ('cache.html#runcache.set', 'langfree/cache.py'),
+                                'langfree.cache.RunCache.stats': ('cache.html#runcache.stats', 'langfree/cache.py'),
+                                'langfree.cache.cached': ('cache.html#cached', 'langfree/cache.py'),
+                                'langfree.cache.disable_cache': ('cache.html#disable_cache', 'langfree/cache.py'),
+                                'langfree.cache.enable_cache': ('cache.html#enable_cache', 'langfree/cache.py'),
+                                'langfree.cache.get_cache': ('cache.html#get_cache', 'langfree/cache.py')},
+            'langfree.chatrecord': { 'langfree.chatrecord.ChatRecord': ('chatrecord.html#chatrecord', 'langfree/chatrecord.py'),
+                                     'langfree.chatrecord.ChatRecord.afrom_run': ( 'chatrecord.html#chatrecord.afrom_run',
+                                                                                   'langfree/chatrecord.py'),
                                      'langfree.chatrecord.ChatRecord.flat_input': ( 'chatrecord.html#chatrecord.flat_input',
                                                                                     'langfree/chatrecord.py'),
                                      'langfree.chatrecord.ChatRecord.flat_output': ( 'chatrecord.html#chatrecord.flat_output',
@@ -23,8 +47,14 @@ d = { 'settings': { 'branch': 'main',
                                                                                     'langfree/chatrecord.py'),
                                      'langfree.chatrecord.ChatRecordSet.__repr__': ( 'chatrecord.html#chatrecordset.__repr__',
                                                                                      'langfree/chatrecord.py'),
+                                     'langfree.chatrecord.ChatRecordSet.__setstate__': ( 'chatrecord.html#chatrecordset.__setstate__',
+                                                                                         'langfree/chatrecord.py'),
+                                     'langfree.chatrecord.ChatRecordSet.afrom_runs': ( 'chatrecord.html#chatrecordset.afrom_runs',
+                                                                                       'langfree/chatrecord.py'),
                                      'langfree.chatrecord.ChatRecordSet.from_commit': ( 'chatrecord.html#chatrecordset.from_commit',
                                                                                         'langfree/chatrecord.py'),
+                                     'langfree.chatrecord.ChatRecordSet.from_pandas': ( 'chatrecord.html#chatrecordset.from_pandas',
+                                                                                        'langfree/chatrecord.py'),
                                      'langfree.chatrecord.ChatRecordSet.from_run_ids': ( 'chatrecord.html#chatrecordset.from_run_ids',
                                                                                          'langfree/chatrecord.py'),
                                      'langfree.chatrecord.ChatRecordSet.from_runs': ( 'chatrecord.html#chatrecordset.from_runs',
@@ -33,20 +63,160 @@ d = { 'settings': { 'branch': 'main',
                                                                                  'langfree/chatrecord.py'),
                                      'langfree.chatrecord.ChatRecordSet.save': ( 'chatrecord.html#chatrecordset.save',
                                                                                  'langfree/chatrecord.py'),
+                                     'langfree.chatrecord.ChatRecordSet.sync': ( 'chatrecord.html#chatrecordset.sync',
+                                                                                 'langfree/chatrecord.py'),
                                      'langfree.chatrecord.ChatRecordSet.to_dicts': ( 'chatrecord.html#chatrecordset.to_dicts',
                                                                                      'langfree/chatrecord.py'),
                                      'langfree.chatrecord.ChatRecordSet.to_pandas': ( 'chatrecord.html#chatrecordset.to_pandas',
                                                                                       'langfree/chatrecord.py'),
+                                     'langfree.chatrecord.CompactRecordSet': ('chatrecord.html#compactrecordset', 'langfree/chatrecord.py'),
+                                     'langfree.chatrecord.CompactRecordSet.__getitem__': ( 'chatrecord.html#compactrecordset.__getitem__',
+                                                                                           'langfree/chatrecord.py'),
+                                     'langfree.chatrecord.CompactRecordSet.__init__': ( 'chatrecord.html#compactrecordset.__init__',
+                                                                                        'langfree/chatrecord.py'),
+                                     'langfree.chatrecord.CompactRecordSet.__iter__': ( 'chatrecord.html#compactrecordset.__iter__',
+                                                                                        'langfree/chatrecord.py'),
+                                     'langfree.chatrecord.CompactRecordSet.__len__': ( 'chatrecord.html#compactrecordset.__len__',
+                                                                                       'langfree/chatrecord.py'),
+                                     'langfree.chatrecord.CompactRecordSet.__repr__': ( 'chatrecord.html#compactrecordset.__repr__',
+                                                                                        'langfree/chatrecord.py'),
+                                     'langfree.chatrecord.CompactRecordSet._id': ( 'chatrecord.html#compactrecordset._id',
+                                                                                   'langfree/chatrecord.py'),
+                                     'langfree.chatrecord.CompactRecordSet._intern': ( 'chatrecord.html#compactrecordset._intern',
+                                                                                       'langfree/chatrecord.py'),
+                                     'langfree.chatrecord.CompactRecordSet._num': ( 'chatrecord.html#compactrecordset._num',
+                                                                                    'langfree/chatrecord.py'),
+                                     'langfree.chatrecord.CompactRecordSet._record': ( 'chatrecord.html#compactrecordset._record',
+                                                                                       'langfree/chatrecord.py'),
+                                     'langfree.chatrecord.CompactRecordSet._url': ( 'chatrecord.html#compactrecordset._url',
+                                                                                    'langfree/chatrecord.py'),
+                                     'langfree.chatrecord.CompactRecordSet.append': ( 'chatrecord.html#compactrecordset.append',
+                                                                                      'langfree/chatrecord.py'),
+                                     'langfree.chatrecord.CompactRecordSet.column': ( 'chatrecord.html#compactrecordset.column',
+                                                                                      'langfree/chatrecord.py'),
+                                     'langfree.chatrecord.CompactRecordSet.to_set': ( 'chatrecord.html#compactrecordset.to_set',
+                                                                                      'langfree/chatrecord.py'),
                                      'langfree.chatrecord.NoChatOpenAI': ('chatrecord.html#nochatopenai', 'langfree/chatrecord.py'),
                                      'langfree.chatrecord.NoChatOpenAI.__init__': ( 'chatrecord.html#nochatopenai.__init__',
                                                                                     'langfree/chatrecord.py'),
+                                     'langfree.chatrecord._aparse_runs': ('chatrecord.html#_aparse_runs', 'langfree/chatrecord.py'),
+                                     'langfree.chatrecord._chunk_feedback': ('chatrecord.html#_chunk_feedback', 'langfree/chatrecord.py'),
+                                     'langfree.chatrecord._iter_checkpointed': ( 'chatrecord.html#_iter_checkpointed',
+                                                                                 'langfree/chatrecord.py'),
+                                     'langfree.chatrecord._iter_parsed': ('chatrecord.html#_iter_parsed', 'langfree/chatrecord.py'),
+                                     'langfree.chatrecord._map_safe': ('chatrecord.html#_map_safe', 'langfree/chatrecord.py'),
+                                     'langfree.chatrecord._pack_id': ('chatrecord.html#_pack_id', 'langfree/chatrecord.py'),
+                                     'langfree.chatrecord._parse_runs': ('chatrecord.html#_parse_runs', 'langfree/chatrecord.py'),
+                                     'langfree.chatrecord._pyarrow': ('chatrecord.html#_pyarrow', 'langfree/chatrecord.py'),
+                                     'langfree.chatrecord._read_journal': ('chatrecord.html#_read_journal', 'langfree/chatrecord.py'),
+                                     'langfree.chatrecord._read_parquet': ('chatrecord.html#_read_parquet', 'langfree/chatrecord.py'),
+                                     'langfree.chatrecord._summarize_runs': ('chatrecord.html#_summarize_runs', 'langfree/chatrecord.py'),
+                                     'langfree.chatrecord._write_parquet': ('chatrecord.html#_write_parquet', 'langfree/chatrecord.py'),
                                      'langfree.chatrecord.get_child_chat_run': ( 'chatrecord.html#get_child_chat_run',
                                                                                  'langfree/chatrecord.py'),
                                      'langfree.chatrecord.get_nested_child_run': ( 'chatrecord.html#get_nested_child_run',
-                                                                                   'langfree/chatrecord.py')},
-            'langfree.runs': { 'langfree.runs._ischatopenai': ('runs.html#_ischatopenai', 'langfree/runs.py'),
+                                                                                   'langfree/chatrecord.py'),
+                                     'langfree.chatrecord.iter_records': ('chatrecord.html#iter_records', 'langfree/chatrecord.py'),
+                                     'langfree.chatrecord.read_parquet': ('chatrecord.html#read_parquet', 'langfree/chatrecord.py')},
+            'langfree.dedup': { 'langfree.dedup.DedupReport': ('dedup.html#dedupreport', 'langfree/dedup.py'),
+                                'langfree.dedup.DedupReport.__repr__': ('dedup.html#dedupreport.__repr__', 'langfree/dedup.py'),
+                                'langfree.dedup.DedupReport.n_unique': ('dedup.html#dedupreport.n_unique', 'langfree/dedup.py'),
+                                'langfree.dedup.Deduper': ('dedup.html#deduper', 'langfree/dedup.py'),
+                                'langfree.dedup.Deduper.__init__': ('dedup.html#deduper.__init__', 'langfree/dedup.py'),
+                                'langfree.dedup.Deduper.__len__': ('dedup.html#deduper.__len__', 'langfree/dedup.py'),
+                                'langfree.dedup.Deduper._find_near': ('dedup.html#deduper._find_near', 'langfree/dedup.py'),
+                                'langfree.dedup.Deduper._signature': ('dedup.html#deduper._signature', 'langfree/dedup.py'),
+                                'langfree.dedup.Deduper.add': ('dedup.html#deduper.add', 'langfree/dedup.py'),
+                                'langfree.dedup.Deduper.clusters': ('dedup.html#deduper.clusters', 'langfree/dedup.py'),
+                                'langfree.dedup.Deduper.report': ('dedup.html#deduper.report', 'langfree/dedup.py'),
+                                'langfree.dedup._digest': ('dedup.html#_digest', 'langfree/dedup.py'),
+                                'langfree.dedup._lsh_params': ('dedup.html#_lsh_params', 'langfree/dedup.py'),
+                                'langfree.dedup._msg_dict': ('dedup.html#_msg_dict', 'langfree/dedup.py'),
+                                'langfree.dedup._shingles': ('dedup.html#_shingles', 'langfree/dedup.py'),
+                                'langfree.dedup._split': ('dedup.html#_split', 'langfree/dedup.py'),
+                                'langfree.dedup.dedup': ('dedup.html#dedup', 'langfree/dedup.py'),
+                                'langfree.dedup.exact_key': ('dedup.html#exact_key', 'langfree/dedup.py'),
+                                'langfree.dedup.find_duplicates': ('dedup.html#find_duplicates', 'langfree/dedup.py'),
+                                'langfree.dedup.iter_dedup': ('dedup.html#iter_dedup', 'langfree/dedup.py'),
+                                'langfree.dedup.normalize': ('dedup.html#normalize', 'langfree/dedup.py')},
+            'langfree.ratelimit': { 'langfree.ratelimit.RateLimitedAdapter': ('ratelimit.html#ratelimitedadapter', 'langfree/ratelimit.py'),
+                                    'langfree.ratelimit.RateLimitedAdapter.__init__': ( 'ratelimit.html#ratelimitedadapter.__init__',
+                                                                                        'langfree/ratelimit.py'),
+                                    'langfree.ratelimit.RateLimitedAdapter._idempotent': ( 'ratelimit.html#ratelimitedadapter._idempotent',
+                                                                                           'langfree/ratelimit.py'),
+                                    'langfree.ratelimit.RateLimitedAdapter._sleep': ( 'ratelimit.html#ratelimitedadapter._sleep',
+                                                                                      'langfree/ratelimit.py'),
+                                    'langfree.ratelimit.RateLimitedAdapter.send': ( 'ratelimit.html#ratelimitedadapter.send',
+                                                                                    'langfree/ratelimit.py'),
+                                    'langfree.ratelimit.RateLimiter': ('ratelimit.html#ratelimiter', 'langfree/ratelimit.py'),
+                                    'langfree.ratelimit.RateLimiter.__init__': ( 'ratelimit.html#ratelimiter.__init__',
+                                                                                 'langfree/ratelimit.py'),
+                                    'langfree.ratelimit.RateLimiter.__repr__': ( 'ratelimit.html#ratelimiter.__repr__',
+                                                                                 'langfree/ratelimit.py'),
+                                    'langfree.ratelimit.RateLimiter.acquire': ( 'ratelimit.html#ratelimiter.acquire',
+                                                                                'langfree/ratelimit.py'),
+                                    'langfree.ratelimit.RateLimiter.record': ('ratelimit.html#ratelimiter.record', 'langfree/ratelimit.py'),
+                                    'langfree.ratelimit.RateLimiter.reset': ('ratelimit.html#ratelimiter.reset', 'langfree/ratelimit.py'),
+                                    'langfree.ratelimit.RateLimiter.stats': ('ratelimit.html#ratelimiter.stats', 'langfree/ratelimit.py'),
+                                    'langfree.ratelimit.RateLimiter.success': ( 'ratelimit.html#ratelimiter.success',
+                                                                                'langfree/ratelimit.py'),
+                                    'langfree.ratelimit.RateLimiter.throttle': ( 'ratelimit.html#ratelimiter.throttle',
+                                                                                 'langfree/ratelimit.py'),
+                                    'langfree.ratelimit._not_sent': ('ratelimit.html#_not_sent', 'langfree/ratelimit.py'),
+                                    'langfree.ratelimit._retry_after': ('ratelimit.html#_retry_after', 'langfree/ratelimit.py')},
+            'langfree.replay': { 'langfree.replay.ReplayResult': ('replay.html#replayresult', 'langfree/replay.py'),
+                                 'langfree.replay.ReplayResult.__repr__': ('replay.html#replayresult.__repr__', 'langfree/replay.py'),
+                                 'langfree.replay._cache_key': ('replay.html#_cache_key', 'langfree/replay.py'),
+                                 'langfree.replay._estimate_tokens': ('replay.html#_estimate_tokens', 'langfree/replay.py'),
+                                 'langfree.replay._message': ('replay.html#_message', 'langfree/replay.py'),
+                                 'langfree.replay._replay_cache': ('replay.html#_replay_cache', 'langfree/replay.py'),
+                                 'langfree.replay.load_batch_output': ('replay.html#load_batch_output', 'langfree/replay.py'),
+                                 'langfree.replay.replay': ('replay.html#replay', 'langfree/replay.py'),
+                                 'langfree.replay.replay_request': ('replay.html#replay_request', 'langfree/replay.py'),
+                                 'langfree.replay.request_key': ('replay.html#request_key', 'langfree/replay.py'),
+                                 'langfree.replay.write_batch_jsonl': ('replay.html#write_batch_jsonl', 'langfree/replay.py')},
+            'langfree.runs': { 'langfree.runs.RunQuery': ('runs.html#runquery', 'langfree/runs.py'),
+                               'langfree.runs.RunQuery.__init__': ('runs.html#runquery.__init__', 'langfree/runs.py'),
+                               'langfree.runs.RunQuery.__iter__': ('runs.html#runquery.__iter__', 'langfree/runs.py'),
+                               'langfree.runs.RunQuery.__repr__': ('runs.html#runquery.__repr__', 'langfree/runs.py'),
+                               'langfree.runs.RunQuery._add': ('runs.html#runquery._add', 'langfree/runs.py'),
+                               'langfree.runs.RunQuery._range': ('runs.html#runquery._range', 'langfree/runs.py'),
+                               'langfree.runs.RunQuery.between': ('runs.html#runquery.between', 'langfree/runs.py'),
+                               'langfree.runs.RunQuery.commit': ('runs.html#runquery.commit', 'langfree/runs.py'),
+                               'langfree.runs.RunQuery.feedback': ('runs.html#runquery.feedback', 'langfree/runs.py'),
+                               'langfree.runs.RunQuery.fetch': ('runs.html#runquery.fetch', 'langfree/runs.py'),
+                               'langfree.runs.RunQuery.filter': ('runs.html#runquery.filter', 'langfree/runs.py'),
+                               'langfree.runs.RunQuery.iter': ('runs.html#runquery.iter', 'langfree/runs.py'),
+                               'langfree.runs.RunQuery.latency': ('runs.html#runquery.latency', 'langfree/runs.py'),
+                               'langfree.runs.RunQuery.metadata': ('runs.html#runquery.metadata', 'langfree/runs.py'),
+                               'langfree.runs.RunQuery.model': ('runs.html#runquery.model', 'langfree/runs.py'),
+                               'langfree.runs.RunQuery.name': ('runs.html#runquery.name', 'langfree/runs.py'),
+                               'langfree.runs.RunQuery.params': ('runs.html#runquery.params', 'langfree/runs.py'),
+                               'langfree.runs.RunQuery.select': ('runs.html#runquery.select', 'langfree/runs.py'),
+                               'langfree.runs.RunQuery.status': ('runs.html#runquery.status', 'langfree/runs.py'),
+                               'langfree.runs.RunQuery.tag': ('runs.html#runquery.tag', 'langfree/runs.py'),
+                               'langfree.runs.RunQuery.tokens': ('runs.html#runquery.tokens', 'langfree/runs.py'),
+                               'langfree.runs.RunQuery.tree_filter': ('runs.html#runquery.tree_filter', 'langfree/runs.py'),
+                               'langfree.runs.RunQuery.where': ('runs.html#runquery.where', 'langfree/runs.py'),
+                               'langfree.runs.__getattr__': ('runs.html#__getattr__', 'langfree/runs.py'),
+                               'langfree.runs._and': ('runs.html#_and', 'langfree/runs.py'),
+                               'langfree.runs._athread': ('runs.html#_athread', 'langfree/runs.py'),
+                               'langfree.runs._commit_tag': ('runs.html#_commit_tag', 'langfree/runs.py'),
+                               'langfree.runs._date_window': ('runs.html#_date_window', 'langfree/runs.py'),
+                               'langfree.runs._day_spans': ('runs.html#_day_spans', 'langfree/runs.py'),
+                               'langfree.runs._feedback_dict': ('runs.html#_feedback_dict', 'langfree/runs.py'),
+                               'langfree.runs._ischatopenai': ('runs.html#_ischatopenai', 'langfree/runs.py'),
+                               'langfree.runs._quote': ('runs.html#_quote', 'langfree/runs.py'),
+                               'langfree.runs._runs_key': ('runs.html#_runs_key', 'langfree/runs.py'),
+                               'langfree.runs._scan_commit_counts': ('runs.html#_scan_commit_counts', 'langfree/runs.py'),
+                               'langfree.runs._semaphore': ('runs.html#_semaphore', 'langfree/runs.py'),
                                'langfree.runs._temp_env_var': ('runs.html#_temp_env_var', 'langfree/runs.py'),
+                               'langfree.runs.aget_feedback': ('runs.html#aget_feedback', 'langfree/runs.py'),
+                               'langfree.runs.aget_runs_by_commit': ('runs.html#aget_runs_by_commit', 'langfree/runs.py'),
                                'langfree.runs.check_api_key': ('runs.html#check_api_key', 'langfree/runs.py'),
+                               'langfree.runs.get_bulk_feedback': ('runs.html#get_bulk_feedback', 'langfree/runs.py'),
+                               'langfree.runs.get_client': ('runs.html#get_client', 'langfree/runs.py'),
+                               'langfree.runs.get_commit_counts': ('runs.html#get_commit_counts', 'langfree/runs.py'),
                                'langfree.runs.get_feedback': ('runs.html#get_feedback', 'langfree/runs.py'),
                                'langfree.runs.get_functions': ('runs.html#get_functions', 'langfree/runs.py'),
                                'langfree.runs.get_last_child': ('runs.html#get_last_child', 'langfree/runs.py'),
@@ -54,28 +224,112 @@ d = { 'settings': { 'branch': 'main',
                                'langfree.runs.get_recent_commit_tags': ('runs.html#get_recent_commit_tags', 'langfree/runs.py'),
                                'langfree.runs.get_recent_runs': ('runs.html#get_recent_runs', 'langfree/runs.py'),
                                'langfree.runs.get_runs_by_commit': ('runs.html#get_runs_by_commit', 'langfree/runs.py'),
+                               'langfree.runs.iter_runs_by_commit': ('runs.html#iter_runs_by_commit', 'langfree/runs.py'),
+                               'langfree.runs.make_client': ('runs.html#make_client', 'langfree/runs.py'),
                                'langfree.runs.reformat_date': ('runs.html#reformat_date', 'langfree/runs.py'),
-                               'langfree.runs.take': ('runs.html#take', 'langfree/runs.py')},
-            'langfree.shiny': { 'langfree.shiny._get_content': ('shiny.html#_get_content', 'langfree/shiny.py'),
+                               'langfree.runs.set_client': ('runs.html#set_client', 'langfree/runs.py'),
+                               'langfree.runs.take': ('runs.html#take', 'langfree/runs.py'),
+                               'langfree.runs.using_client': ('runs.html#using_client', 'langfree/runs.py')},
+            'langfree.search': { 'langfree.search.RecordIndex': ('search.html#recordindex', 'langfree/search.py'),
+                                 'langfree.search.RecordIndex.__init__': ('search.html#recordindex.__init__', 'langfree/search.py'),
+                                 'langfree.search.RecordIndex.__len__': ('search.html#recordindex.__len__', 'langfree/search.py'),
+                                 'langfree.search.RecordIndex.__repr__': ('search.html#recordindex.__repr__', 'langfree/search.py'),
+                                 'langfree.search.RecordIndex.search': ('search.html#recordindex.search', 'langfree/search.py'),
+                                 'langfree.search.RecordIndex.update': ('search.html#recordindex.update', 'langfree/search.py'),
+                                 'langfree.search.RecordIndex.values': ('search.html#recordindex.values', 'langfree/search.py'),
+                                 'langfree.search._fields': ('search.html#_fields', 'langfree/search.py')},
+            'langfree.shiny': { 'langfree.shiny.ReviewStore': ('shiny.html#reviewstore', 'langfree/shiny.py'),
+                                'langfree.shiny.ReviewStore.__init__': ('shiny.html#reviewstore.__init__', 'langfree/shiny.py'),
+                                'langfree.shiny.ReviewStore.__len__': ('shiny.html#reviewstore.__len__', 'langfree/shiny.py'),
+                                'langfree.shiny.ReviewStore.__repr__': ('shiny.html#reviewstore.__repr__', 'langfree/shiny.py'),
+                                'langfree.shiny.ReviewStore.apply': ('shiny.html#reviewstore.apply', 'langfree/shiny.py'),
+                                'langfree.shiny.ReviewStore.compact': ('shiny.html#reviewstore.compact', 'langfree/shiny.py'),
+                                'langfree.shiny.ReviewStore.history': ('shiny.html#reviewstore.history', 'langfree/shiny.py'),
+                                'langfree.shiny.ReviewStore.latest': ('shiny.html#reviewstore.latest', 'langfree/shiny.py'),
+                                'langfree.shiny.ReviewStore.record': ('shiny.html#reviewstore.record', 'langfree/shiny.py'),
+                                'langfree.shiny.ReviewStore.resume': ('shiny.html#reviewstore.resume', 'langfree/shiny.py'),
+                                'langfree.shiny._get_content': ('shiny.html#_get_content', 'langfree/shiny.py'),
                                 'langfree.shiny._get_role': ('shiny.html#_get_role', 'langfree/shiny.py'),
                                 'langfree.shiny.invoke_later': ('shiny.html#invoke_later', 'langfree/shiny.py'),
                                 'langfree.shiny.render_funcs': ('shiny.html#render_funcs', 'langfree/shiny.py'),
                                 'langfree.shiny.render_input_chat': ('shiny.html#render_input_chat', 'langfree/shiny.py'),
                                 'langfree.shiny.render_llm_output': ('shiny.html#render_llm_output', 'langfree/shiny.py')},
-            'langfree.transform': { 'langfree.transform.RunData': ('transform.html#rundata', 'langfree/transform.py'),
+            'langfree.test_utils': { 'langfree.test_utils.FakeClient': ('test_utils.html#fakeclient', 'langfree/test_utils.py'),
+                                     'langfree.test_utils.FakeClient.__init__': ( 'test_utils.html#fakeclient.__init__',
+                                                                                  'langfree/test_utils.py'),
+                                     'langfree.test_utils.FakeClient._index': ( 'test_utils.html#fakeclient._index',
+                                                                                'langfree/test_utils.py'),
+                                     'langfree.test_utils.FakeClient.add_traces': ( 'test_utils.html#fakeclient.add_traces',
+                                                                                    'langfree/test_utils.py'),
+                                     'langfree.test_utils.FakeClient.list_feedback': ( 'test_utils.html#fakeclient.list_feedback',
+                                                                                       'langfree/test_utils.py'),
+                                     'langfree.test_utils.FakeClient.list_runs': ( 'test_utils.html#fakeclient.list_runs',
+                                                                                   'langfree/test_utils.py'),
+                                     'langfree.test_utils.FakeClient.read_run': ( 'test_utils.html#fakeclient.read_run',
+                                                                                  'langfree/test_utils.py'),
+                                     'langfree.test_utils._matches': ('test_utils.html#_matches', 'langfree/test_utils.py'),
+                                     'langfree.test_utils.fake_chat_run': ('test_utils.html#fake_chat_run', 'langfree/test_utils.py'),
+                                     'langfree.test_utils.fake_feedback': ('test_utils.html#fake_feedback', 'langfree/test_utils.py'),
+                                     'langfree.test_utils.fake_trace': ('test_utils.html#fake_trace', 'langfree/test_utils.py')},
+            'langfree.tokens': { 'langfree.tokens.TokenCounter': ('tokens.html#tokencounter', 'langfree/tokens.py'),
+                                 'langfree.tokens.TokenCounter.__init__': ('tokens.html#tokencounter.__init__', 'langfree/tokens.py'),
+                                 'langfree.tokens.TokenCounter.__repr__': ('tokens.html#tokencounter.__repr__', 'langfree/tokens.py'),
+                                 'langfree.tokens.TokenCounter.examples': ('tokens.html#tokencounter.examples', 'langfree/tokens.py'),
+                                 'langfree.tokens.TokenCounter.messages': ('tokens.html#tokencounter.messages', 'langfree/tokens.py'),
+                                 'langfree.tokens._count_chunk': ('tokens.html#_count_chunk', 'langfree/tokens.py'),
+                                 'langfree.tokens._day': ('tokens.html#_day', 'langfree/tokens.py'),
+                                 'langfree.tokens._hash': ('tokens.html#_hash', 'langfree/tokens.py'),
+                                 'langfree.tokens._item_tokens': ('tokens.html#_item_tokens', 'langfree/tokens.py'),
+                                 'langfree.tokens.cost_summary': ('tokens.html#cost_summary', 'langfree/tokens.py'),
+                                 'langfree.tokens.iter_within_limit': ('tokens.html#iter_within_limit', 'langfree/tokens.py'),
+                                 'langfree.tokens.model_price': ('tokens.html#model_price', 'langfree/tokens.py'),
+                                 'langfree.tokens.token_index': ('tokens.html#token_index', 'langfree/tokens.py')},
+            'langfree.transform': { 'langfree.transform.JsonlReport': ('transform.html#jsonlreport', 'langfree/transform.py'),
+                                    'langfree.transform.JsonlReport.__repr__': ( 'transform.html#jsonlreport.__repr__',
+                                                                                 'langfree/transform.py'),
+                                    'langfree.transform.JsonlReport.ok': ('transform.html#jsonlreport.ok', 'langfree/transform.py'),
+                                    'langfree.transform.RunData': ('transform.html#rundata', 'langfree/transform.py'),
                                     'langfree.transform.RunData._flatten_data': ( 'transform.html#rundata._flatten_data',
                                                                                   'langfree/transform.py'),
                                     'langfree.transform.RunData.flat_input': ('transform.html#rundata.flat_input', 'langfree/transform.py'),
                                     'langfree.transform.RunData.flat_output': ( 'transform.html#rundata.flat_output',
                                                                                 'langfree/transform.py'),
+                                    'langfree.transform.RunData.from_run': ('transform.html#rundata.from_run', 'langfree/transform.py'),
                                     'langfree.transform.RunData.from_run_id': ( 'transform.html#rundata.from_run_id',
                                                                                 'langfree/transform.py'),
                                     'langfree.transform.RunData.outputs': ('transform.html#rundata.outputs', 'langfree/transform.py'),
                                     'langfree.transform.RunData.to_json': ('transform.html#rundata.to_json', 'langfree/transform.py'),
                                     'langfree.transform.RunData.to_msg_dict': ( 'transform.html#rundata.to_msg_dict',
                                                                                 'langfree/transform.py'),
+                                    'langfree.transform._ShuffleBuffer': ('transform.html#_shufflebuffer', 'langfree/transform.py'),
+                                    'langfree.transform._ShuffleBuffer.__init__': ( 'transform.html#_shufflebuffer.__init__',
+                                                                                    'langfree/transform.py'),
+                                    'langfree.transform._ShuffleBuffer._spill': ( 'transform.html#_shufflebuffer._spill',
+                                                                                  'langfree/transform.py'),
+                                    'langfree.transform._ShuffleBuffer.add': ('transform.html#_shufflebuffer.add', 'langfree/transform.py'),
+                                    'langfree.transform._ShuffleBuffer.write_to': ( 'transform.html#_shufflebuffer.write_to',
+                                                                                    'langfree/transform.py'),
+                                    'langfree.transform._count_tokens': ('transform.html#_count_tokens', 'langfree/transform.py'),
+                                    'langfree.transform._encoding': ('transform.html#_encoding', 'langfree/transform.py'),
+                                    'langfree.transform._example_errors': ('transform.html#_example_errors', 'langfree/transform.py'),
+                                    'langfree.transform._example_tokens': ('transform.html#_example_tokens', 'langfree/transform.py'),
+                                    'langfree.transform._flatten_chunk': ('transform.html#_flatten_chunk', 'langfree/transform.py'),
+                                    'langfree.transform._flatten_msgs': ('transform.html#_flatten_msgs', 'langfree/transform.py'),
+                                    'langfree.transform._format_call': ('transform.html#_format_call', 'langfree/transform.py'),
+                                    'langfree.transform._msg_key': ('transform.html#_msg_key', 'langfree/transform.py'),
+                                    'langfree.transform._open_text': ('transform.html#_open_text', 'langfree/transform.py'),
+                                    'langfree.transform._openai_client': ('transform.html#_openai_client', 'langfree/transform.py'),
+                                    'langfree.transform._picklable': ('transform.html#_picklable', 'langfree/transform.py'),
+                                    'langfree.transform._run_componets': ('transform.html#_run_componets', 'langfree/transform.py'),
+                                    'langfree.transform._to_json': ('transform.html#_to_json', 'langfree/transform.py'),
+                                    'langfree.transform._token_stats': ('transform.html#_token_stats', 'langfree/transform.py'),
+                                    'langfree.transform._valid_name': ('transform.html#_valid_name', 'langfree/transform.py'),
+                                    'langfree.transform._validate_range': ('transform.html#_validate_range', 'langfree/transform.py'),
+                                    'langfree.transform.afetch_run_componets': ( 'transform.html#afetch_run_componets',
+                                                                                 'langfree/transform.py'),
                                     'langfree.transform.chat': ('transform.html#chat', 'langfree/transform.py'),
                                     'langfree.transform.fetch_run_componets': ( 'transform.html#fetch_run_componets',
                                                                                 'langfree/transform.py'),
+                                    'langfree.transform.flatten_runs': ('transform.html#flatten_runs', 'langfree/transform.py'),
                                     'langfree.transform.validate_jsonl': ('transform.html#validate_jsonl', 'langfree/transform.py'),
                                     'langfree.transform.write_to_jsonl': ('transform.html#write_to_jsonl', 'langfree/transform.py')}}}
@@ -0,0 +1,168 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/06_cache.ipynb.
+
+# %% auto 0
+__all__ = ['RunCache', 'enable_cache', 'disable_cache', 'get_cache', 'cached', 'CommitRollup']
+
+# %% ../nbs/06_cache.ipynb 3
+import time, pickle, sqlite3, threading
+from datetime import date
+from pathlib import Path
+from functools import wraps
+from typing import Callable, Union, List, Dict, Tuple
+
+# %% ../nbs/06_cache.ipynb 6
+class RunCache:
+    "A SQLite backed cache of LangSmith data with expiry and least-recently-used eviction."
+    def __init__(self, 
+                 path:Union[str,Path]=Path.home()/'.cache'/'langfree'/'runs.db', # where to store the cache
+                 max_bytes:int=2**30, # evict the least recently used entries beyond this size
+                 ttl:float=3600 # seconds before data that can change, like feedback, expires
+                ):
+        self.path, self.max_bytes, self.ttl = Path(path), max_bytes, ttl
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits, self.misses, self._lock = 0, 0, threading.RLock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('''CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, size INTEGER, 
+                            expires REAL, accessed REAL)''')
+        self._db.execute('CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)')
+        self.size = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM cache').fetchone()[0]
+
+    def get(self, key:str, default=None):
+        "Get the value stored under `key`, or `default` if it is missing or expired."
+        with self._lock:
+            row = self._db.execute('SELECT value, expires FROM cache WHERE key=?', (key,)).fetchone()
+            if row is None or (row[1] is not None and row[1] < time.time()):
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._db.execute('UPDATE cache SET accessed=? WHERE key=?', (time.time(), key))
+            return pickle.loads(row[0])
+
+    def set(self, key:str, value, ttl:float=None):
+        "Store `value` under `key`, expiring after `ttl` seconds if given."
+        data = pickle.dumps(value)
+        now = time.time()
+        with self._lock:
+            self.delete(key)
+            self._db.execute('INSERT INTO cache VALUES (?,?,?,?,?)', 
+                             (key, data, len(data), None if ttl is None else now+ttl, now))
+            self.size += len(data)
+            self._evict()
+
+    def delete(self, key:str):
+        "Remove `key` from the cache."
+        with self._lock:
+            row = self._db.execute('SELECT size FROM cache WHERE key=?', (key,)).fetchone()
+            if row is None: return
+            self._db.execute('DELETE FROM cache WHERE key=?', (key,))
+            self.size -= row[0]
+
+    def _evict(self):
+        while self.size > self.max_bytes:
+            key, = self._db.execute('SELECT key FROM cache ORDER BY accessed LIMIT 1').fetchone()
+            self.delete(key)
+
+    def clear(self):
+        "Remove everything from the cache and reset the counters."
+        with self._lock:
+            self._db.execute('DELETE FROM cache')
+            self.size, self.hits, self.misses = 0, 0, 0
+
+    def __len__(self): return self._db.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+    def __contains__(self, key):
+        "Whether `key` is stored and hasn't expired, without counting a hit or miss or marking it as used."
+        with self._lock: row = self._db.execute('SELECT expires FROM cache WHERE key=?', (key,)).fetchone()
+        return row is not None and (row[0] is None or row[0] >= time.time())
+
+    def stats(self):
+        "The number of hits, misses, entries and bytes in the cache."
+        return dict(hits=self.hits, misses=self.misses, entries=len(self), bytes=self.size)
+
+    def __repr__(self): return f'RunCache({str(self.path)!r}, {self.stats()})'
+
+# %% ../nbs/06_cache.ipynb 14
+_cache = None
+
+def enable_cache(path:Union[str,Path]=None, **kwargs) -> RunCache:
+    "Cache data fetched from LangSmith in a `RunCache` at `path`.  `kwargs` are passed to `RunCache`."
+    global _cache
+    _cache = RunCache(path, **kwargs) if path else RunCache(**kwargs)
+    return _cache
+
+def disable_cache():
+    "Stop caching data fetched from LangSmith."
+    global _cache
+    _cache = None
+
+def get_cache() -> Union[RunCache, None]:
+    "The `RunCache` in use, if caching is enabled."
+    return _cache
+
+# %% ../nbs/06_cache.ipynb 15
+def cached(key:Callable=None, # builds the cache key from the arguments of the decorated function
+           expires:bool=False, # whether results expire after `RunCache.ttl`, for data that can change
+           keep:Callable=None # called with the arguments, return `False` to skip caching, e.g. for unfinished runs
+          ):
+    "Decorator that stores the results of a function in the active `RunCache`."
+    key = key or (lambda *args, **kwargs: repr((args, sorted(kwargs.items()))))
+    def _deco(f):
+        @wraps(f)
+        def _inner(*args, **kwargs):
+            cache = get_cache()
+            if cache is None or (keep and not keep(*args, **kwargs)): return f(*args, **kwargs)
+            k = f'{f.__name__}:{key(*args, **kwargs)}'
+            res = cache.get(k, cache)
+            if res is cache:
+                res = f(*args, **kwargs)
+                cache.set(k, res, ttl=cache.ttl if expires else None)
+            return res
+        return _inner
+    return _deco
+
+# %% ../nbs/06_cache.ipynb 18
+class CommitRollup:
+    "Daily counts of runs per commit for LangSmith projects, stored in SQLite."
+    def __init__(self, 
+                 path:Union[str,Path]=Path.home()/'.cache'/'langfree'/'rollups.db' # where to store the rollups
+                ):
+        self.path, self._lock = Path(path), threading.RLock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS days (project TEXT, day TEXT, PRIMARY KEY (project, day))')
+        self._db.execute('''CREATE TABLE IF NOT EXISTS counts (project TEXT, day TEXT, commit_id TEXT, n INTEGER, 
+                            PRIMARY KEY (project, day, commit_id))''')
+
+    def missing(self, project:str, days:List[date]) -> List[date]:
+        "The `days` that haven't been rolled up for `project`."
+        with self._lock:
+            done = {d for d, in self._db.execute('SELECT day FROM days WHERE project=? AND day BETWEEN ? AND ?', 
+                                                 (project, min(days).isoformat(), max(days).isoformat()))} if days else set()
+        return [d for d in days if d.isoformat() not in done]
+
+    def add(self, project:str, day:date, counts:Dict[str,int]):
+        "Store the number of runs for each commit on `day`, replacing anything stored for that day."
+        with self._lock:
+            self._db.execute('BEGIN')
+            self._db.execute('DELETE FROM counts WHERE project=? AND day=?', (project, day.isoformat()))
+            self._db.executemany('INSERT INTO counts VALUES (?,?,?,?)', 
+                                 [(project, day.isoformat(), c, n) for c,n in counts.items()])
+            self._db.execute('INSERT OR REPLACE INTO days VALUES (?,?)', (project, day.isoformat()))
+            self._db.execute('COMMIT')
+
+    def counts(self, project:str, start:date, end:date) -> Dict[Tuple[date,str],int]:
+        "The stored number of runs for each `(day, commit)` from `start` to `end`, inclusive."
+        with self._lock:
+            rows = self._db.execute('SELECT day, commit_id, n FROM counts WHERE project=? AND day BETWEEN ? AND ?', 
+                                    (project, start.isoformat(), end.isoformat())).fetchall()
+        return {(date.fromisoformat(d), c): n for d,c,n in rows}
+
+    def clear(self, project:str=None):
+        "Forget the rollups for `project`, or for every project."
+        with self._lock:
+            for t in ('days', 'counts'): 
+                if project is None: self._db.execute(f'DELETE FROM {t}')
+                else: self._db.execute(f'DELETE FROM {t} WHERE project=?', (project,))
+
+    def __repr__(self): return f'CommitRollup({str(self.path)!r})'
@@ -1,35 +1,43 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/03_chatrecord.ipynb.
 
 # %% auto 0
-__all__ = ['NoChatOpenAI', 'get_nested_child_run', 'get_child_chat_run', 'ChatRecord', 'ChatRecordSet']
+__all__ = ['NoChatOpenAI', 'get_nested_child_run', 'get_child_chat_run', 'ChatRecord', 'iter_records', 'ChatRecordSet',
+           'read_parquet', 'CompactRecordSet']
 
 # %% ../nbs/03_chatrecord.ipynb 3
-from typing import List, Iterable, Union
+from typing import List, Iterable, Union, Callable, Dict
 from collections import Counter
 from pathlib import Path
-import pickle
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from array import array
+from math import nan, isnan
+import os, copy, uuid, pickle, json, zlib, asyncio
 
-import pandas as pd
 from pydantic import BaseModel
-import langsmith
+import langsmith.schemas
+from langsmith.utils import LangSmithNotFoundError
 from fastcore.foundation import first, L
-from fastcore.test import test_eq
-from .runs import (get_runs_by_commit, 
+from fastcore.basics import chunked
+from fastcore.test import test_eq, test_fail
+from .runs import (get_runs_by_commit, check_api_key,
                            get_params, get_functions,
-                          get_feedback)
+                          get_feedback, get_bulk_feedback, get_client, _athread)
 from .transform import RunData
-from langsmith import Client
+from .cache import cached
 
-# %% ../nbs/03_chatrecord.ipynb 5
+# %% ../nbs/03_chatrecord.ipynb 6
 class NoChatOpenAI(Exception):
     def __init__(self, message, extra_data=None):
         super().__init__(message)
 
-# %% ../nbs/03_chatrecord.ipynb 6
+# %% ../nbs/03_chatrecord.ipynb 7
+@cached(key=lambda run: run.id, keep=lambda run: run.end_time is not None) # finished runs don't change
 def get_nested_child_run(run):
     "Get the last nested `ChatOpenAI` run inside a Runnable Agent."
-    client = Client()
-    run = client.read_run(run_id=run.id, load_child_runs=True)
+    if run.child_runs is None: # only fetch the tree of child runs if it isn't already loaded
+        client = get_client()
+        run = client.read_run(run_id=run.id, load_child_runs=True)
     oai_children = []
     for r in run.child_runs:
         if r.name == 'RunnableAgent':
@@ -44,15 +52,15 @@ def get_nested_child_run(run):
 
 def get_child_chat_run(run):
     "Get the last child `ChatOpenAI` run."
-    client = Client()
+    client = get_client()
     if run.parent_run_id is not None:
     # if run.execution_order != 1: # this is a child run, get the parent
-        run = client.read_run(run.parent_run_id)
+        run = client.read_run(run.parent_run_id, load_child_runs=True)
 
     crun = get_nested_child_run(run)
     return run, crun
 
-# %% ../nbs/03_chatrecord.ipynb 9
+# %% ../nbs/03_chatrecord.ipynb 10
 class ChatRecord(BaseModel):
     "A parsed run from LangSmith, focused on the `ChatOpenAI` run type."
     child_run_id:str
@@ -86,22 +94,23 @@ class ChatRecord(BaseModel):
                     run_id:str # the run id to fetch and parse.
                    ):
         "Collect information About A Run into a `ChatRecord`."
-        client = Client()
+        client = get_client()
         return cls.from_run(client.read_run(run_id=run_id))
     
     @classmethod
     def from_run(cls, 
-                 run:langsmith.schemas.Run # the run object to parse.
+                 run:langsmith.schemas.Run, # the run object to parse.
+                 feedback:list=None # feedback for the root run, fetched from LangSmith if not provided.
                 ):
         "Collect information About A Run into a `ChatRecord`."
         run, crun = get_child_chat_run(run)
     
         if crun:
             params = get_params(crun)
-            _feedback = get_feedback(run) # you must get feedback from the root
+            _feedback = get_feedback(run) if feedback is None else feedback # you must get feedback from the root
             
             return cls(child_run_id=str(crun.id),
-                       child_run=RunData.from_run_id(str(crun.id)),
+                       child_run=RunData.from_run(crun),
                        child_url=crun.url,
                        parent_run_id=str(run.id) if run else None,
                        parent_url=run.url if run else None,
@@ -115,34 +124,210 @@ class ChatRecord(BaseModel):
                        function_defs=get_functions(crun),
                        **params)
 
-# %% ../nbs/03_chatrecord.ipynb 19
+    @classmethod
+    async def afrom_run(cls, 
+                        run:langsmith.schemas.Run, # the run object to parse.
+                        feedback:list=None # feedback for the root run, fetched from LangSmith if not provided.
+                       ):
+        "Async version of `ChatRecord.from_run`."
+        return await _athread(cls.from_run, run, feedback=feedback)
+
+# %% ../nbs/03_chatrecord.ipynb 22
+_parse_errors = (NoChatOpenAI, TypeError, ValueError, KeyError) # a run that can't be parsed, unlike client or HTTP errors
+
+def _map_safe(f:Callable, items:list, n_workers:int=8, catch:tuple=_parse_errors) -> list:
+    "`(f(o), None)` for each of `items` in order, or `(None, error)` if `f` raises one of `catch`, using a pool of `n_workers` threads."
+    def _safe(o):
+        try: return f(o), None
+        except catch as e: return None, f'{type(e).__name__}: {e}'
+    if not n_workers: return [_safe(o) for o in items]
+    with ThreadPoolExecutor(n_workers) as ex: return list(ex.map(_safe, items))
+
+def _parse_runs(f:Callable, # parses one item into a `ChatRecord`
+                items:Iterable, # runs or run ids
+                key:Callable=str, # how to name an item in the error report
+                n_workers:int=8, # number of threads, 0 parses serially
+                catch:tuple=_parse_errors # the exceptions that are reported as errors, others are raised
+               ):
+    "Apply `f` to `items` using a pool of `n_workers` threads, returning records in input order and errors keyed by item."
+    items = list(items)
+    results = _map_safe(f, items, n_workers=n_workers, catch=catch)
+    records = [r for r,e in results if e is None]
+    errors = {key(o):e for o,(r,e) in zip(items, results) if e is not None}
+    return records, errors
+
+async def _aparse_runs(f:Callable, # an async function that parses one item into a `ChatRecord`
+                       items:Iterable, # runs or run ids
+                       key:Callable=str, # how to name an item in the error report
+                       max_concurrency:int=8 # maximum number of items parsed at once
+                      ):
+    "Async version of `_parse_runs`, awaiting `f` for at most `max_concurrency` items at a time."
+    sem = asyncio.Semaphore(max_concurrency)
+    async def _safe(o):
+        async with sem:
+            try: return await f(o), None
+            except _parse_errors as e: return None, f'{type(e).__name__}: {e}'
+    items = list(items)
+    results = await asyncio.gather(*map(_safe, items))
+    records = [r for r,e in results if e is None]
+    errors = {key(o):e for o,(r,e) in zip(items, results) if e is not None}
+    return records, errors
+
+def iter_records(runs:Iterable[langsmith.schemas.Run], # the runs to parse, for example from `iter_runs_by_commit`.
+                 n_workers:int=8, # number of threads fetching runs concurrently, 0 parses serially.
+                 chunk_size:int=100, # number of runs fetched and held in memory at a time.
+                 errors:dict=None # if given, runs that can't be parsed are added to it, keyed by run id.
+                ) -> Iterable[ChatRecord]:
+    "Lazily parse `runs` into `ChatRecord`s, `chunk_size` runs at a time, so memory use doesn't grow with the number of runs."
+    for run, record, err in _iter_parsed(runs, n_workers=n_workers, chunk_size=chunk_size):
+        if err is None: yield record
+        elif errors is not None: errors[str(run.id)] = err
+
+def _chunk_feedback(chunk:list) -> dict:
+    "Feedback for the root runs of `chunk`, or nothing if the bulk request fails, so that each run fetches its own."
+    try: return get_bulk_feedback(r.parent_run_id or r.id for r in chunk) # feedback lives on the root run
+    except Exception: return {}
+
+def _iter_parsed(runs:Iterable, n_workers:int=8, chunk_size:int=100):
+    "Parse `runs` `chunk_size` at a time, yielding `(run, record, error)` for each run in order."
+    for chunk in chunked(runs, chunk_size):
+        _feedback = _chunk_feedback(chunk)
+        _parse = lambda r: ChatRecord.from_run(r, feedback=_feedback.get(str(r.parent_run_id or r.id)))
+        for run, (record, err) in zip(chunk, _map_safe(_parse, chunk, n_workers=n_workers)): yield run, record, err
+
+def _read_journal(path:Path):
+    "The records and errors in a checkpoint journal, keyed by run id.  The last entry for a run wins."
+    records, errors = {}, {}
+    if not Path(path).exists(): return records, errors
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try: entry = json.loads(line)
+            except ValueError: continue # a line cut short by a crash
+            rid = entry['run_id']
+            if 'record' in entry:
+                records[rid] = ChatRecord(**entry['record'])
+                errors.pop(rid, None)
+            else: errors[rid] = entry['error']
+    return records, errors
+
+def _iter_checkpointed(runs:Iterable, path:Path, n_workers:int=8, chunk_size:int=100, errors:dict=None):
+    "Like `iter_records`, but take the records of runs already in the journal at `path` from it, and append each new record or error to it."
+    done, _ = _read_journal(path)
+    with open(path, 'a', encoding='utf-8') as f:
+        for chunk in chunked(runs, chunk_size):
+            todo = [r for r in chunk if str(r.id) not in done] # runs that failed are tried again
+            for run, record, err in _iter_parsed(todo, n_workers=n_workers, chunk_size=chunk_size):
+                rid = str(run.id)
+                entry = dict(run_id=rid, error=err) if err else dict(run_id=rid, record=record.model_dump(mode='json'))
+                f.write(json.dumps(entry) + '\n')
+                if err is None: done[rid] = record
+                elif errors is not None: errors[rid] = err
+            f.flush()
+            os.fsync(f.fileno())
+            for r in chunk: # in the order of `runs`, ignoring runs in the journal that aren't in it
+                if str(r.id) in done: yield done[str(r.id)]
+
+# %% ../nbs/03_chatrecord.ipynb 23
+_json_cols = ['child_run', 'feedback', 'function_defs'] # nested fields that are stored as JSON strings
+
+def _pyarrow():
+    "Import `pyarrow` and `pyarrow.parquet`, which are needed to read and write Parquet files."
+    try: import pyarrow as pa, pyarrow.parquet as pq
+    except ImportError: raise ImportError('Reading and writing Parquet files needs pyarrow, install it with `pip install pyarrow`.') from None
+    return pa, pq
+
+def _write_parquet(crs, path:Path, row_group_size:int=10_000):
+    "Write the records of `crs` to a Parquet file with one column per field of `ChatRecord`."
+    pa, pq = _pyarrow()
+    rows = [dict(r) for r in crs.records]
+    cols = {k: [r[k] for r in rows] for k in ChatRecord.model_fields}
+    for k in _json_cols: cols[k] = [json.dumps(dict(v) if isinstance(v, BaseModel) else v) for v in cols[k]]
+    cols['start_date'] = [datetime.strptime(d, '%m/%d/%Y').date() if d else None for d in cols['start_dt']]
+    meta = dict(errors=crs.errors, high_water={k:v.isoformat() for k,v in crs.high_water.items()})
+    table = pa.table(cols).replace_schema_metadata({'langfree': json.dumps(meta)})
+    pq.write_table(table, path, row_group_size=row_group_size)
+
+def _read_parquet(cls, path:Path, filters=None):
+    "Read a `ChatRecordSet` written by `_write_parquet`, keeping only the rows that match `filters`."
+    _, pq = _pyarrow()
+    table = pq.read_table(path, filters=filters)
+    meta = json.loads((table.schema.metadata or {}).get(b'langfree', b'{}'))
+    rows = table.drop(['start_date']).to_pylist()
+    for r in rows: 
+        for k in _json_cols: r[k] = json.loads(r[k])
+    return cls(records=[ChatRecord(**r) for r in rows], **meta)
+
+# %% ../nbs/03_chatrecord.ipynb 24
+def _summarize_runs(runs:List[RunData]) -> dict:
+    "Columns that summarize the conversation in each of `runs`."
+    msgs = [r.inputs + [r.output] for r in runs]
+    return dict(n_messages=[len(m) for m in msgs],
+                n_content_chars=[sum(len(x.get('content') or '') for x in m) for m in msgs],
+                function_calls=[[x['function_call']['name'] for x in m if 'function_call' in x] for m in msgs])
+
+# %% ../nbs/03_chatrecord.ipynb 25
 class ChatRecordSet(BaseModel):
     "A List of `ChatRecord`."
     records: List[ChatRecord]
+    errors: Dict[str,str] = {}
+    high_water: Dict[str,datetime] = {}
+
+    def __setstate__(self, state):
+        "Fill in the fields that sets pickled by older versions of langfree don't have."
+        d = state.setdefault('__dict__', {})
+        for k,f in type(self).model_fields.items():
+            if k not in d and not f.is_required(): d[k] = copy.deepcopy(f.get_default(call_default_factory=True))
+        super().__setstate__(state)
     
     @classmethod
-    def from_commit(cls, commit_id:str, limit:int=None):
+    def from_commit(cls, commit_id:str, limit:int=None, n_workers:int=8, checkpoint:str=None):
         "Create a `ChatRecordSet` from a commit id"
         _runs = get_runs_by_commit(commit_id=commit_id, limit=limit)
-        return cls.from_runs(_runs)
+        return cls.from_runs(_runs, n_workers=n_workers, checkpoint=checkpoint)
     
     @classmethod
-    def from_runs(cls, runs:List[langsmith.schemas.Run]):
+    def from_runs(cls, 
+                  runs:List[langsmith.schemas.Run], # the runs to parse.
+                  n_workers:int=8, # number of threads fetching runs concurrently, 0 parses serially.
+                  chunk_size:int=100, # number of runs fetched at a time, and saved to `checkpoint` at a time.
+                  checkpoint:str=None # a journal file of finished records, which lets an interrupted build resume where it stopped.
+                 ):
         "Load ChatRecordSet from runs."
-        _records = []
-        for r in runs:
-            try: _records.append(ChatRecord.from_run(r))
-            except NoChatOpenAI as e: print(e) 
-        return cls(records=_records)
+        _errors = {}
+        if checkpoint: _records = list(_iter_checkpointed(runs, Path(checkpoint), n_workers=n_workers, chunk_size=chunk_size, errors=_errors))
+        else: _records = list(iter_records(runs, n_workers=n_workers, chunk_size=chunk_size, errors=_errors))
+        if _errors: print(f'Unable to parse {len(_errors)} runs, see `ChatRecordSet.errors` for details.')
+        return cls(records=_records, errors=_errors)
+
+    @classmethod
+    async def afrom_runs(cls, 
+                         runs:List[langsmith.schemas.Run], # the runs to parse.
+                         max_concurrency:int=8, # maximum number of runs fetched and parsed at once.
+                         chunk_size:int=100 # number of runs to get feedback for in each request.
+                        ):
+        "Async version of `ChatRecordSet.from_runs`."
+        _records, _errors = [], {}
+        for chunk in chunked(runs, chunk_size):
+            _feedback = await _athread(_chunk_feedback, chunk)
+            _parse = lambda r: ChatRecord.afrom_run(r, feedback=_feedback.get(str(r.parent_run_id or r.id)))
+            records, errs = await _aparse_runs(_parse, chunk, key=lambda r: str(r.id), max_concurrency=max_concurrency)
+            _records += records
+            _errors.update(errs)
+        if _errors: print(f'Unable to parse {len(_errors)} runs, see `ChatRecordSet.errors` for details.')
+        return cls(records=_records, errors=_errors)
 
     @classmethod
-    def from_run_ids(cls, runs:List[str]):
+    def from_run_ids(cls, 
+                     runs:List[str], # the run ids to fetch and parse.
+                     n_workers:int=8 # number of threads fetching runs concurrently, 0 parses serially.
+                    ):
         "Load ChatRecordSet from run ids."
-        _records = []
-        for r in runs:
-            try: _records.append(ChatRecord.from_run_id(r))
-            except NoChatOpenAI as e: print(e)
-        return cls(records=_records)
+        client = get_client()
+        _runs, _errors = _parse_runs(lambda r: client.read_run(run_id=r), runs, key=str, n_workers=n_workers, catch=LangSmithNotFoundError)
+        if _errors: print(f'Unable to fetch {len(_errors)} runs, see `ChatRecordSet.errors` for details.')
+        crs = cls.from_runs(_runs, n_workers=n_workers)
+        crs.errors = {**_errors, **crs.errors}
+        return crs
     
     def __len__(self): return len(self.records)
 
@@ -153,9 +338,12 @@ class ChatRecordSet(BaseModel):
         return f'`List[ChatRecord]` of size {len(self.records)}.'
     
     def save(self, path:str):
-        "Save data to disk."
+        "Save data to disk, as Parquet if `path` ends with `.parquet` and as a pickle otherwise."
         dest_path = Path(path)
         if not dest_path.parent.exists(): dest_path.parent.mkdir(exist_ok=True)
+        if dest_path.suffix == '.parquet': 
+            _write_parquet(self, dest_path)
+            return dest_path
         with open(dest_path, 'wb') as f:
             pickle.dump(self, f)
             return dest_path
@@ -165,21 +353,179 @@ class ChatRecordSet(BaseModel):
             yield r
     
     @classmethod
-    def load(cls, path:str):
+    def load(cls, 
+             path:str, # a file written by `ChatRecordSet.save`
+             filters=None # only load the rows of a Parquet file that match these `pyarrow` filters
+            ):
         "Load data from disk."
         src_path = Path(path)
+        if src_path.suffix == '.parquet': return _read_parquet(cls, src_path, filters=filters)
         with open(src_path, 'rb') as f:
             obj = pickle.load(f)
             if isinstance(obj, cls):
                 return obj
             else:
                 raise TypeError(f"The loaded object is not of type {cls.__name__}")
+
+    @classmethod
+    def sync(cls, 
+             path:str, # where the `ChatRecordSet` is saved, it is created if it doesn't exist.
+             commit_id:str=None, # the commit ID to filter by
+             proj_id:str=None, # Langsmith Project ID
+             n_workers:int=8, # number of threads fetching runs concurrently, 0 parses serially.
+             lookback:float=3600 # seconds before the high-water mark to fetch again, for runs that finished after the last sync
+            ):
+        "Add runs that are newer than the last sync to the `ChatRecordSet` saved at `path`."
+        crs = cls.load(path) if Path(path).exists() else cls(records=[])
+        key = f'{proj_id or check_api_key("LANGSMITH_PROJECT_ID")}:{commit_id}'
+        since = crs.high_water.get(key)
+        after = since - timedelta(seconds=lookback) if since else None
+        runs = get_runs_by_commit(commit_id=commit_id, proj_id=proj_id, after=after)
+        seen = set(L(crs.records).attrgot('parent_run_id'))
+        new_runs = [r for r in runs if str(r.id) not in seen] # runs in the lookback window are returned again
+        if new_runs:
+            new = cls.from_runs(new_runs, n_workers=n_workers)
+            crs.records += new.records
+            crs.errors.update(new.errors)
+            crs.high_water[key] = max([r.start_time for r in new_runs] + ([since] if since else []))
+        crs.save(path)
+        return crs
                 
-    def to_pandas(self):
+    def to_pandas(self, 
+                  child_run:str='object' # keep the `RunData` objects ('object'), summarize them in columns ('flatten') or leave them out ('omit').
+                 ):
         "Convert the `ChatRecordSet` to a pandas.DataFrame."
-        records = L(self.records).map(dict)                      
-        return pd.DataFrame(records)
+        if child_run not in ('object', 'flatten', 'omit'): raise ValueError(f"child_run must be 'object', 'flatten' or 'omit', not {child_run!r}")
+        fields = [k for k in ChatRecord.model_fields if k != 'child_run' or child_run == 'object']
+        cols = {k: [getattr(r, k) for r in self.records] for k in fields}
+        if child_run == 'flatten': cols.update(_summarize_runs([r.child_run for r in self.records]))
+        import pandas as pd
+        return pd.DataFrame(cols)
+
+    @classmethod
+    def from_pandas(cls, df):
+        "Create a `ChatRecordSet` from a DataFrame made with `ChatRecordSet.to_pandas()`."
+        fields = [k for k in ChatRecord.model_fields if k in df.columns]
+        df = df[fields].astype(object)
+        cols = [df[k].where(df[k].notna(), None).tolist() for k in fields]
+        return cls(records=[ChatRecord(**dict(zip(fields, vals))) for vals in zip(*cols)])
 
     def to_dicts(self):
         "Convert the ChatRecordSet to a list of dicts, which you can convert to jsonl."
         return list(L(self.records).map(lambda x: x.child_run.to_msg_dict()))
+
+# %% ../nbs/03_chatrecord.ipynb 59
+def read_parquet(path:str, # a file written by `ChatRecordSet.save`
+                 columns:List[str]=None, # the columns to read, all of them by default
+                 filters=None # only read the rows that match these `pyarrow` filters
+                ):
+    "Read `columns` of the rows that match `filters` from a `ChatRecordSet` saved as Parquet."
+    _, pq = _pyarrow()
+    return pq.read_table(path, columns=columns, filters=filters).to_pandas()
+
+# %% ../nbs/03_chatrecord.ipynb 78
+_num_fields = ['total_tokens', 'prompt_tokens', 'completion_tokens', 'param_n', 'param_top_p', 'param_temp', 
+               'param_presence_penalty', 'param_freq_penalty'] # stored in typed arrays
+_interned_fields = ['start_dt', 'tags', 'function_defs', 'feedback_keys', 'param_model_name'] # values that repeat across records
+_id_fields = {'child_run_id': 'child_url', 'parent_run_id': 'parent_url'} # run ids, and the url of each run
+_nil = bytes(16) # stands for a missing run id
+
+def _pack_id(run_id:str) -> Union[bytes,None]:
+    "The 16 bytes of `run_id`, `_nil` if it is missing, or `None` if it isn't a UUID in its canonical form."
+    if not run_id: return _nil
+    try: u = uuid.UUID(run_id)
+    except (ValueError, TypeError): return None
+    return u.bytes if str(u) == run_id else None
+
+class CompactRecordSet:
+    "A memory efficient list of `ChatRecord`s that builds each record when it is accessed."
+    __slots__ = ('_pool', '_index', '_nums', '_refs', '_ids', '_other_ids', '_blobs', 'errors')
+
+    def __init__(self, 
+                 records:Iterable[ChatRecord]=(), # for example a `ChatRecordSet`
+                 errors:Dict[str,str]=None # runs that couldn't be parsed, defaults to `records.errors`
+                ):
+        self._pool, self._index = [], {} # distinct values as JSON, and their position in the pool
+        self._nums = {k: array('d') for k in _num_fields} # NaN stands for None
+        self._refs = {k: array('L') for k in _interned_fields + list(_id_fields.values())} # positions in the pool
+        self._ids = {k: bytearray() for k in _id_fields} # 16 bytes per UUID
+        self._other_ids = {k: {} for k in _id_fields} # position -> run ids that aren't UUIDs
+        self._blobs = [] # the conversation and any other fields, as compressed JSON
+        self.errors = dict(errors if errors is not None else getattr(records, 'errors', {}))
+        for r in records: self.append(r)
+
+    def _intern(self, v) -> int:
+        s = json.dumps(v)
+        if s not in self._index:
+            self._index[s] = len(self._pool)
+            self._pool.append(s)
+        return self._index[s]
+
+    def append(self, record:ChatRecord):
+        "Add `record` to the end of the set."
+        for k in _num_fields: self._nums[k].append(nan if getattr(record, k) is None else getattr(record, k))
+        for k in _interned_fields: self._refs[k].append(self._intern(getattr(record, k)))
+        for k,u in _id_fields.items(): 
+            run_id, url = getattr(record, k), getattr(record, u)
+            packed = _pack_id(run_id)
+            if packed is None: self._other_ids[k][len(self._blobs)] = run_id
+            self._ids[k] += packed or _nil
+            self._refs[u].append(self._intern(url.split(run_id) if url and run_id else url)) # urls only differ by the run id
+        rest = {k: getattr(record, k) for k in ChatRecord.model_fields 
+                if k not in _num_fields + _interned_fields + list(_id_fields) + list(_id_fields.values())}
+        run = rest['child_run']
+        rest['child_run'] = dict(inputs=[self._intern(m) if m.get('role') == 'system' else m for m in run.inputs], 
+                                 output=run.output, funcs=self._intern(run.funcs), 
+                                 run_id=None if run.run_id == record.child_run_id else run.run_id)
+        self._blobs.append(zlib.compress(json.dumps(rest).encode(), 1))
+
+    def _num(self, k, i):
+        v = self._nums[k][i]
+        return None if isnan(v) else int(v) if v.is_integer() else v
+
+    def _id(self, k, i):
+        if i in self._other_ids[k]: return self._other_ids[k][i]
+        b = bytes(self._ids[k][16*i:16*(i+1)])
+        return None if b == _nil else str(uuid.UUID(bytes=b))
+
+    def _url(self, k, i):
+        url = json.loads(self._pool[self._refs[_id_fields[k]][i]])
+        return self._id(k, i).join(url) if isinstance(url, list) else url
+
+    def _record(self, i:int) -> ChatRecord:
+        rest, load = json.loads(zlib.decompress(self._blobs[i])), lambda j: json.loads(self._pool[j])
+        run = rest.pop('child_run')
+        child_run_id = self._id('child_run_id', i)
+        child_run = RunData.model_construct(inputs=[load(m) if isinstance(m, int) else m for m in run['inputs']], 
+                                            output=run['output'], funcs=load(run['funcs']), run_id=run['run_id'] or child_run_id)
+        return ChatRecord.model_construct(child_run=child_run, **rest, 
+                                          **{k: self._num(k, i) for k in _num_fields},
+                                          **{k: load(self._refs[k][i]) for k in _interned_fields},
+                                          **{k: self._id(k, i) for k in _id_fields},
+                                          **{u: self._url(k, i) for k,u in _id_fields.items()})
+
+    def column(self, field:str) -> list:
+        "The values of `field` for every record, only building the records for the fields that are compressed."
+        if field in _num_fields: return [self._num(field, i) for i in range(len(self))]
+        if field in _id_fields: return [self._id(field, i) for i in range(len(self))]
+        if field in _interned_fields: 
+            vals = {}
+            return [vals[j] if j in vals else vals.setdefault(j, json.loads(self._pool[j])) for j in self._refs[field]]
+        return [getattr(r, field) for r in self]
+
+    def __len__(self): return len(self._blobs)
+
+    def __getitem__(self, index:Union[int,slice]) -> Union[ChatRecord, List[ChatRecord]]:
+        if isinstance(index, slice): return [self._record(i) for i in range(*index.indices(len(self)))]
+        if not -len(self) <= index < len(self): raise IndexError('CompactRecordSet index out of range')
+        return self._record(index % len(self))
+
+    def __iter__(self):
+        for i in range(len(self)): yield self._record(i)
+
+    def to_set(self) -> ChatRecordSet:
+        "Build every record into a `ChatRecordSet`."
+        return ChatRecordSet(records=list(self), errors=self.errors)
+
+    def __repr__(self):
+        return f'`CompactRecordSet` of size {len(self)} with {len(self._pool)} distinct values.'
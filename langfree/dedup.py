@@ -0,0 +1,156 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/08_dedup.ipynb.
+
+# %% auto 0
+__all__ = ['normalize', 'exact_key', 'Deduper', 'DedupReport', 'iter_dedup', 'dedup', 'find_duplicates']
+
+# %% ../nbs/08_dedup.ipynb 3
+import re, json, zlib, hashlib
+from array import array
+from typing import Iterable, List, Dict, Tuple, Union
+
+import numpy as np
+from pydantic import BaseModel
+from fastcore.foundation import L
+
+# %% ../nbs/08_dedup.ipynb 6
+def _msg_dict(item) -> dict:
+    "The `to_msg_dict` of a `ChatRecord` or `RunData`, or `item` if it is already a dict."
+    if hasattr(item, 'child_run'): item = item.child_run
+    return item.to_msg_dict() if hasattr(item, 'to_msg_dict') else item
+
+_ws = re.compile(r'\s+')
+
+def normalize(o):
+    "`o` with whitespace in strings collapsed and `None` values dropped, so that trivially different copies are equal."
+    if isinstance(o, str): return _ws.sub(' ', o).strip()
+    if isinstance(o, dict): return {k: normalize(v) for k,v in o.items() if v is not None}
+    if isinstance(o, (list, tuple)): return [normalize(v) for v in o]
+    return o
+
+def _digest(o) -> bytes: return hashlib.blake2b(json.dumps(o, sort_keys=True).encode(), digest_size=16).digest()
+
+def exact_key(item) -> str:
+    "A hash of `item` that is the same for exact duplicates."
+    return _digest(normalize(_msg_dict(item))).hex()
+
+# %% ../nbs/08_dedup.ipynb 8
+_prime = np.uint64((1 << 61) - 1)
+
+def _split(d:dict) -> Tuple[bytes, str]:
+    "A hash of the system prompts and functions in `d`, and the text of the rest of the conversation."
+    msgs = d.get('messages') or []
+    context = _digest(normalize([d.get('functions')] + [m for m in msgs if m.get('role') == 'system']))
+    text = ' '.join(f"{m.get('role')}: {m.get('content') or ''} {json.dumps(m.get('function_call') or '')}" 
+                    for m in msgs if m.get('role') != 'system')
+    return context, text
+
+def _shingles(text:str, n:int) -> np.ndarray:
+    "Hashes of the word `n`-grams in `text`."
+    words = text.lower().split()
+    grams = {' '.join(words[i:i+n]) for i in range(max(1, len(words)-n+1))}
+    return np.fromiter((zlib.crc32(g.encode()) for g in grams), dtype=np.uint64, count=len(grams))
+
+def _lsh_params(threshold:float, num_perm:int) -> Tuple[int,int]:
+    "The `(bands, rows)` with `bands*rows == num_perm` whose similarity cutoff, `(1/bands)**(1/rows)`, is the highest one below `threshold`."
+    divs = [b for b in range(1, num_perm+1) if num_perm % b == 0]
+    b = max(divs, key=lambda b: ((1/b)**(b/num_perm) <= threshold, -b)) # candidates are checked against `threshold` afterwards
+    return b, num_perm // b
+
+# %% ../nbs/08_dedup.ipynb 9
+class Deduper:
+    "Finds exact and near duplicates in one pass over a stream of conversations."
+    def __init__(self, 
+                 threshold:float=0.8, # minimum estimated Jaccard similarity of near duplicates
+                 num_perm:int=128, # number of MinHash permutations, more are more accurate and slower
+                 ngram:int=3, # number of words in each shingle
+                 near:bool=True, # find near duplicates as well as exact duplicates
+                 seed:int=0 # seed for the MinHash permutations
+                ):
+        self.threshold, self.ngram, self.near = threshold, ngram, near
+        rng = np.random.default_rng(seed)
+        # like `datasketch`, `a*h+b` is allowed to overflow, which mixes the bits of small hashes into the result
+        self._a, self._b = rng.integers(1, _prime, num_perm, dtype=np.uint64), rng.integers(0, _prime, num_perm, dtype=np.uint64)
+        self.bands, self.rows = _lsh_params(threshold, num_perm)
+        self._exact = {} # hash -> index of the first item with that hash
+        self._buckets = {} # band of a signature -> index of the first item in that bucket
+        self._sigs = {} # index -> MinHash signature, for items that aren't duplicates
+        self._dups = array('q') # index of the item each item duplicates, or -1
+        self.n_exact, self.n_near = 0, 0
+
+    def _signature(self, text:str) -> np.ndarray:
+        h = _shingles(text, self.ngram)
+        return ((np.outer(self._a, h) + self._b[:, None]) % _prime).min(axis=1).astype(np.uint32)
+
+    def _find_near(self, i:int, d:dict) -> Union[int,None]:
+        context, text = _split(d)
+        sig = self._signature(text)
+        keys = [context + b.to_bytes(2, 'little') + sig[b*self.rows:(b+1)*self.rows].tobytes() for b in range(self.bands)]
+        for k in keys:
+            j = self._buckets.get(k)
+            if j is not None and (self._sigs[j] == sig).mean() >= self.threshold: return j
+        for k in keys: self._buckets.setdefault(k, i)
+        self._sigs[i] = sig
+        return None
+
+    def add(self, item) -> Union[int,None]:
+        "Add `item`, returning the index of the earlier item that it duplicates, or `None` if it is new."
+        i, d = len(self._dups), _msg_dict(item)
+        key = _digest(normalize(d))
+        dup = self._exact.get(key)
+        if dup is not None:
+            if self._dups[dup] >= 0: dup = self._dups[dup] # point at the first item of the cluster
+            self.n_exact += 1
+        else:
+            self._exact[key] = i
+            dup = self._find_near(i, d) if self.near else None
+            if dup is not None: self.n_near += 1
+        self._dups.append(-1 if dup is None else dup)
+        return dup
+
+    def __len__(self): return len(self._dups)
+
+    def clusters(self) -> Dict[int,List[int]]:
+        "The first item of each group of duplicates -> the indices of its duplicates."
+        res = {}
+        for i,d in enumerate(self._dups):
+            if d >= 0: res.setdefault(d, []).append(i)
+        return res
+
+    def report(self) -> 'DedupReport':
+        "Summarize the duplicates found so far."
+        clusters = sorted(self.clusters().items(), key=lambda x: len(x[1]), reverse=True)
+        return DedupReport(n_items=len(self), n_exact=self.n_exact, n_near=self.n_near, clusters=dict(clusters))
+
+# %% ../nbs/08_dedup.ipynb 10
+class DedupReport(BaseModel):
+    "The duplicates found by a `Deduper`."
+    n_items:int
+    n_exact:int # number of items that are exact duplicates of an earlier item
+    n_near:int # number of items that are near duplicates of an earlier item
+    clusters:Dict[int,List[int]] # the first item of each group of duplicates -> its duplicates, largest groups first
+
+    @property
+    def n_unique(self) -> int: return self.n_items - self.n_exact - self.n_near
+
+    def __repr__(self):
+        top = ', '.join(f'{k}: {len(v)}' for k,v in list(self.clusters.items())[:5])
+        return (f'{self.n_items} items, {self.n_unique} unique\n'
+                f'Exact duplicates: {self.n_exact}, near duplicates: {self.n_near}\n'
+                f'Largest clusters (first item: duplicates): {top or "none"}')
+
+# %% ../nbs/08_dedup.ipynb 11
+def iter_dedup(items:Iterable, **kwargs) -> Iterable:
+    "Lazily yield the `items` that don't duplicate an earlier item.  `kwargs` are passed to `Deduper`."
+    dd = Deduper(**kwargs)
+    for o in items:
+        if dd.add(o) is None: yield o
+
+def dedup(items:Iterable, **kwargs) -> L:
+    "The `items` that don't duplicate an earlier item.  `kwargs` are passed to `Deduper`."
+    return L(iter_dedup(items, **kwargs))
+
+def find_duplicates(items:Iterable, **kwargs) -> DedupReport:
+    "A report of the duplicates in `items`.  `kwargs` are passed to `Deduper`."
+    dd = Deduper(**kwargs)
+    for o in items: dd.add(o)
+    return dd.report()
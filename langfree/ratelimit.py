@@ -0,0 +1,143 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/07_ratelimit.ipynb.
+
+# %% auto 0
+__all__ = ['shared_limiter', 'RateLimiter', 'RateLimitedAdapter']
+
+# %% ../nbs/07_ratelimit.ipynb 3
+import time, random, threading
+from typing import Tuple
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from requests import exceptions
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError, ConnectTimeoutError
+
+# %% ../nbs/07_ratelimit.ipynb 6
+class RateLimiter:
+    "A thread-safe token bucket that allows `rate` requests per second, and slows down when the server is rate limiting us."
+    def __init__(self, 
+                 rate:float=25, # the maximum number of requests per second
+                 burst:int=None, # requests that can be made at once after a quiet period, defaults to `rate`
+                 min_rate:float=0.5, # the rate is never lowered below this
+                 recovery:float=0.05 # fraction of `rate` the rate grows by after each successful request
+                ):
+        self.max_rate, self.min_rate, self.recovery = rate, min_rate, recovery
+        self.burst = burst or max(1, int(rate))
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        "Go back to the full rate and clear the metrics."
+        with self._lock:
+            self.rate, self.tokens, self.waited = self.max_rate, float(self.burst), 0.
+            self.updated = self.started = time.monotonic()
+            self.counts = Counter()
+
+    def acquire(self, n:float=1):
+        "Block until a request that costs `n` tokens can be made.  Requests that cost more than `burst` wait for a full bucket."
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated)*self.rate)
+                self.updated = now
+                need = min(n, self.burst)
+                if self.tokens >= need:
+                    self.tokens -= n
+                    self.counts['requests'] += 1
+                    return
+                wait = (need - self.tokens)/self.rate
+                self.waited += wait
+            time.sleep(wait)
+
+    def throttle(self, retry_after:float=None):
+        "Halve the rate after a 429 response, and hold back every request for `retry_after` seconds if given."
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate/2)
+            self.tokens = -(retry_after or 0)*self.rate # the bucket is empty until `retry_after` has passed
+            self.counts['throttled'] += 1
+
+    def success(self):
+        "Speed back up towards the maximum rate after a successful request."
+        with self._lock: self.rate = min(self.max_rate, self.rate + self.recovery*self.max_rate)
+
+    def record(self, key:str):
+        "Count an event, like a retry, in `stats`."
+        with self._lock: self.counts[key] += 1
+
+    def stats(self) -> dict:
+        "Counts of requests, 429s, retries and failures, with the current rate, the throughput and the seconds spent waiting."
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            return dict({'requests':0, 'throttled':0, 'retries':0, 'failures':0, **self.counts}, rate=round(self.rate, 2), 
+                        throughput=round(self.counts['requests']/elapsed, 2) if elapsed else 0., waited=round(self.waited, 2))
+
+    def __repr__(self): return f'RateLimiter({self.stats()})'
+
+# %% ../nbs/07_ratelimit.ipynb 14
+_retry_statuses = {429, 500, 502, 503, 504}
+
+def _retry_after(response) -> float:
+    "Seconds to wait according to the `Retry-After` header of `response`, which is either a number of seconds or a date."
+    val = response.headers.get('Retry-After')
+    if not val: return None
+    try: return max(0., float(val))
+    except ValueError: pass
+    try: return max(0., (parsedate_to_datetime(val) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError): return None
+
+_idempotent = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'TRACE'}
+
+def _not_sent(e:Exception) -> bool:
+    "Whether a request failed before it was sent, because a connection couldn't be opened."
+    reason = getattr(e.args[0], 'reason', None) if e.args else None
+    return isinstance(e, exceptions.ConnectTimeout) or isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+class RateLimitedAdapter(HTTPAdapter):
+    "A `requests` adapter that waits for `limiter` before each request and retries failed requests with jittered exponential backoff."
+    def __init__(self, 
+                 limiter:RateLimiter=None, # shared by every request, defaults to `shared_limiter`
+                 retries:int=5, # times a throttled, failed or timed out request is retried
+                 backoff:float=0.5, # seconds to back off after the first failure, doubling after each one
+                 max_backoff:float=60, # the longest time to back off
+                 read_posts:Tuple[str,...]=('/runs/query',), # paths of POST requests that only read data, so they are as safe to retry as a GET
+                 **kwargs # passed to `requests.adapters.HTTPAdapter`, e.g. `pool_maxsize`
+                ):
+        self.limiter, self.retries, self.backoff, self.max_backoff = limiter or shared_limiter, retries, backoff, max_backoff
+        self.read_posts = tuple(read_posts)
+        super().__init__(**kwargs)
+
+    def _idempotent(self, request) -> bool:
+        "Whether sending `request` twice has the same effect as sending it once, which makes it safe to retry after a timeout or 5xx."
+        return request.method in _idempotent or (request.method == 'POST' and urlparse(request.url).path.endswith(self.read_posts))
+
+    def _sleep(self, attempt:int, wait:float=None):
+        time.sleep(random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt)) if wait is None else wait)
+
+    def send(self, request, **kwargs):
+        for attempt in range(self.retries + 1):
+            last = attempt == self.retries
+            self.limiter.acquire()
+            try: resp = super().send(request, **kwargs)
+            except (exceptions.ConnectionError, exceptions.Timeout) as e:
+                # a write that may have reached the server isn't sent again, so it can't be applied twice
+                retry = not last and (_not_sent(e) or self._idempotent(request))
+                self.limiter.record('retries' if retry else 'failures')
+                if not retry: raise
+                self._sleep(attempt)
+                continue
+            if resp.status_code not in _retry_statuses:
+                self.limiter.success()
+                return resp
+            wait = _retry_after(resp)
+            if resp.status_code == 429: self.limiter.throttle(wait) # the server refused the request, so it is always safe to retry
+            retry = not last and (resp.status_code == 429 or self._idempotent(request))
+            self.limiter.record('retries' if retry else 'failures')
+            if not retry: return resp
+            resp.close()
+            # after a 429 with `Retry-After`, the limiter holds the request back
+            if not (resp.status_code == 429 and wait is not None): self._sleep(attempt, wait)
+
+# %% ../nbs/07_ratelimit.ipynb 15
+shared_limiter = RateLimiter() # shared by all of the LangSmith clients made with `langfree.runs.make_client`
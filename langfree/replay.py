@@ -0,0 +1,132 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/09_replay.ipynb.
+
+# %% auto 0
+__all__ = ['replay_request', 'request_key', 'ReplayResult', 'replay', 'write_batch_jsonl', 'load_batch_output']
+
+# %% ../nbs/09_replay.ipynb 3
+import json, hashlib
+from pathlib import Path
+from typing import Iterable, Callable, List, Dict, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from pydantic import BaseModel
+from fastcore.foundation import L
+from .transform import chat, _example_tokens, _msg_keys
+from .cache import RunCache, get_cache
+from .ratelimit import RateLimiter
+
+# %% ../nbs/09_replay.ipynb 6
+def replay_request(item, # a `RunData` or `ChatRecord`
+                   model:str, # the model to send the conversation to
+                   **params # other arguments for the chat completions API, like `temperature`
+                  ) -> dict:
+    "The body of a chat completions request with the inputs and functions of `item`."
+    run = getattr(item, 'child_run', item)
+    body = dict(model=model, messages=run.inputs, **params)
+    if run.funcs: body['functions'] = run.funcs
+    return body
+
+def request_key(body:dict) -> str:
+    "A hash of a request `body` that responses are cached under."
+    return hashlib.sha256(json.dumps(body, sort_keys=True).encode()).hexdigest()
+
+def _cache_key(key:str) -> str: return f'replay:{key}'
+
+def _replay_cache(cache:RunCache=None) -> RunCache:
+    "`cache` if given, else the active cache, else the default replay cache.  An empty `RunCache` is falsy, so this checks for `None`."
+    if cache is None: cache = get_cache()
+    if cache is None: cache = RunCache(Path.home()/'.cache'/'langfree'/'replay.db')
+    return cache
+
+def _message(response:dict) -> dict:
+    "The assistant message in a chat completion `response`, in the same format as `RunData.output`."
+    msg = response['choices'][0]['message']
+    return {k: msg[k] for k in _msg_keys if msg.get(k) is not None}
+
+def _estimate_tokens(body:dict) -> int:
+    "Tokens a request counts against a tokens-per-minute limit: its prompt, and the tokens it may generate."
+    return _example_tokens(body) + (body.get('max_tokens') or 0)
+
+# %% ../nbs/09_replay.ipynb 7
+class ReplayResult(BaseModel):
+    "The result of `replay`."
+    outputs:List[Union[dict,None]] # the new assistant message for each item, or `None` if its request failed
+    errors:Dict[int,str] # the position of each item whose request failed -> the error
+    n_cached:int # number of responses that were already in the cache
+    usage:Dict[str,int] # tokens used by the requests that were made
+
+    def __repr__(self):
+        return (f'{len(self.outputs)} outputs, {self.n_cached} from the cache, {len(self.errors)} errors\n'
+                f'Tokens used: {self.usage}')
+
+def replay(items:Iterable, # `RunData` or `ChatRecord`s, like a `ChatRecordSet`
+           model:str='gpt-3.5-turbo', # the model to send the conversations to
+           max_workers:int=8, # maximum number of requests in flight
+           tpm:int=90_000, # tokens per minute budget
+           cache:RunCache=None, # where responses are cached, defaults to the active cache or `~/.cache/langfree/replay.db`
+           limiter:RateLimiter=None, # limits the tokens per minute, overrides `tpm`
+           complete:Callable=chat, # makes a chat completions request, and returns the response
+           **params # other arguments for the chat completions API, like `temperature`
+          ) -> ReplayResult:
+    "Send the conversations in `items` to `model` concurrently and return the new outputs, resuming from any cached responses."
+    cache = _replay_cache(cache)
+    limiter = limiter or RateLimiter(rate=tpm/60, burst=tpm, min_rate=tpm/600)
+    bodies = [replay_request(o, model, **params) for o in items]
+    keys = [request_key(b) for b in bodies]
+    responses = {k: cache.get(_cache_key(k)) for k in dict.fromkeys(keys)}
+    todo = {k: b for k,b in zip(keys, bodies) if responses[k] is None}
+    n_cached = sum(responses[k] is not None for k in keys)
+
+    def _send(key, body):
+        limiter.acquire(_estimate_tokens(body))
+        res = complete(**body)
+        res = res if isinstance(res, dict) else res.model_dump()
+        cache.set(_cache_key(key), res) # saved as soon as it arrives, so an interrupted replay can resume
+        return res
+
+    usage, errs = dict(prompt_tokens=0, completion_tokens=0, total_tokens=0), {}
+    with ThreadPoolExecutor(max_workers) as ex:
+        futs = {ex.submit(_send, k, b): k for k,b in todo.items()}
+        for f in as_completed(futs):
+            k = futs[f]
+            try: responses[k] = f.result()
+            except Exception as e: errs[k] = f'{type(e).__name__}: {e}'
+            else:
+                for u in usage: usage[u] += (responses[k].get('usage') or {}).get(u) or 0
+    if errs: print(f'{len(errs)} requests failed, see `ReplayResult.errors` for details.')
+    return ReplayResult(outputs=[_message(responses[k]) if responses[k] else None for k in keys],
+                        errors={i: errs[k] for i,k in enumerate(keys) if k in errs}, n_cached=n_cached, usage=usage)
+
+# %% ../nbs/09_replay.ipynb 12
+def write_batch_jsonl(items:Iterable, # `RunData` or `ChatRecord`s, like a `ChatRecordSet`
+                      fname:str, # the `.jsonl` file to write
+                      model:str='gpt-3.5-turbo', # the model to send the conversations to
+                      cache:RunCache=None, # requests with a response in this cache are left out
+                      **params # other arguments for the chat completions API, like `temperature`
+                     ) -> int:
+    "Write the requests `replay` would make for `items` in the OpenAI Batch API input format, returning the number of requests."
+    seen, n = set(), 0
+    with open(fname, 'w', encoding='utf-8') as f:
+        for o in items:
+            body = replay_request(o, model, **params)
+            key = request_key(body)
+            if key in seen or (cache is not None and _cache_key(key) in cache): continue
+            seen.add(key)
+            f.write(json.dumps(dict(custom_id=key, method='POST', url='/v1/chat/completions', body=body)) + '\n')
+            n += 1
+    return n
+
+def load_batch_output(fname:str, # the output file of a finished batch
+                      cache:RunCache=None # where responses are cached, defaults to the active cache or `~/.cache/langfree/replay.db`
+                     ) -> Dict[str,str]:
+    "Add the responses in a Batch API output file to the cache that `replay` reads from, and return the errors by `custom_id`."
+    cache = _replay_cache(cache)
+    errors = {}
+    with open(fname, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip(): continue
+            r = json.loads(line)
+            res = r.get('response') or {}
+            if res.get('status_code') == 200: cache.set(_cache_key(r['custom_id']), res['body'])
+            else: errors[r['custom_id']] = json.dumps(r.get('error') or res.get('body'))
+    return errors
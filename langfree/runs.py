@@ -1,23 +1,24 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/01_runs.ipynb.
 
 # %% auto 0
-__all__ = ['client', 'check_api_key', 'reformat_date', 'take', 'get_runs_by_commit', 'get_last_child', 'get_recent_runs',
-           'get_recent_commit_tags', 'get_params', 'get_functions', 'get_feedback']
+__all__ = ['max_concurrency', 'check_api_key', 'make_client', 'get_client', 'set_client', 'using_client', 'reformat_date', 'take',
+           'RunQuery', 'iter_runs_by_commit', 'get_runs_by_commit', 'aget_runs_by_commit', 'get_last_child',
+           'get_recent_runs', 'get_commit_counts', 'get_recent_commit_tags', 'get_params', 'get_functions',
+           'get_feedback', 'aget_feedback', 'get_bulk_feedback']
 
 # %% ../nbs/01_runs.ipynb 3
-from collections import defaultdict
-import os
-from datetime import date, timedelta, datetime
+from collections import defaultdict, Counter
+import os, copy, json, inspect, threading, asyncio, weakref, functools, contextvars
+from datetime import date, timedelta, datetime, timezone
 from itertools import islice
-from typing import List, Iterable
+from typing import List, Iterable, Dict, Union, Tuple
 from pprint import pformat
 from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 
-import pandas as pd
-from langchain.load import load
-import langsmith
-from langsmith import Client
+import langsmith.schemas
 from fastcore.foundation import L, first
+from .cache import cached, get_cache, CommitRollup
 
 # %% ../nbs/01_runs.ipynb 4
 @contextmanager
@@ -46,73 +47,259 @@ def check_api_key(nm="LANGCHAIN_HUB_API_KEY"):
     return val
 
 # %% ../nbs/01_runs.ipynb 6
-check_api_key("LANGCHAIN_API_KEY")
-check_api_key("LANGCHAIN_ENDPOINT")
-check_api_key("LANGSMITH_PROJECT_ID")
-client = Client()
+def make_client(pool_size:int=16, # connections kept open to LangSmith, this should be at least the number of threads making requests
+                timeout:Union[float,Tuple[float,float]]=(10, 90), # connect and read timeouts in seconds
+                keep_alive:bool=True, # reuse connections across requests rather than closing them after each one
+                retries:int=5, # times a throttled, failed or timed out request is retried
+                limiter=None, # a `RateLimiter` for the requests, defaults to `langfree.ratelimit.shared_limiter`
+                **kwargs # passed on to `langsmith.Client`
+               ):
+    "Create a rate limited `langsmith.Client` with a connection pool of `pool_size` connections."
+    check_api_key("LANGCHAIN_API_KEY")
+    check_api_key("LANGCHAIN_ENDPOINT")
+    from langsmith import Client
+    from langfree.ratelimit import RateLimitedAdapter
+    if not isinstance(timeout, tuple): timeout = (timeout, timeout)
+    client = Client(timeout_ms=tuple(int(t*1000) for t in timeout), **kwargs)
+    # `Client` mounts its own adapter, so replace it with one that has the pool size, rate limit and retries we want.  This also turns 
+    # off the urllib3 retries of `Client.retry_config`, so that a request isn't retried `retries` times for each of those retries.  
+    # `Client` only retries a few of its calls itself (see `stop_after_attempt` in `Client.request_with_retries`).
+    adapter = RateLimitedAdapter(limiter=limiter, retries=retries, max_retries=0, pool_connections=pool_size, pool_maxsize=pool_size)
+    for prefix in ('http://', 'https://'): client.session.mount(prefix, adapter)
+    if not keep_alive: client.session.headers['Connection'] = 'close'
+    return client
 
-# %% ../nbs/01_runs.ipynb 8
+# %% ../nbs/01_runs.ipynb 7
+_client, _client_lock = None, threading.Lock()
+
+def get_client():
+    "The `langsmith.Client` shared by langfree, created with `make_client` the first time it is needed."
+    global _client
+    with _client_lock:
+        if _client is None: _client = make_client()
+    return _client
+
+def set_client(client=None, # a `langsmith.Client`, or any object with the same methods
+               **kwargs # passed to `make_client` when `client` is None
+              ):
+    "Use `client` for every request langfree makes to LangSmith."
+    global _client
+    with _client_lock: _client = client if client is not None else make_client(**kwargs)
+    return _client
+
+@contextmanager
+def using_client(client):
+    "Temporarily use `client` for the requests langfree makes to LangSmith."
+    global _client
+    with _client_lock: prev, _client = _client, client
+    try: yield client
+    finally:
+        with _client_lock: _client = prev
+
+def __getattr__(name):
+    # `client` used to be created when this module was imported
+    if name == 'client': return get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# %% ../nbs/01_runs.ipynb 10
+max_concurrency = 16 # requests the async functions in langfree make to LangSmith at once, per event loop
+_semaphores = weakref.WeakKeyDictionary()
+
+def _semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    if loop not in _semaphores or _semaphores[loop][0] != max_concurrency:
+        _semaphores[loop] = max_concurrency, asyncio.Semaphore(max_concurrency)
+    return _semaphores[loop][1]
+
+async def _athread(f, *args, **kwargs):
+    "Call `f` in a worker thread, so it doesn't block the event loop, with at most `max_concurrency` calls running at once."
+    call = functools.partial(contextvars.copy_context().run, f, *args, **kwargs) # what `asyncio.to_thread` does, which needs Python 3.9
+    async with _semaphore(): return await asyncio.get_running_loop().run_in_executor(None, call)
+
+# %% ../nbs/01_runs.ipynb 12
 def reformat_date(date_str):
     "Reformat m/d/y to YYYY-MM-DD."
     date_obj = datetime.strptime(date_str, '%m/%d/%Y')  # Parsing the date
     formatted_date = date_obj.strftime('%Y-%m-%d')      # Formatting to YYYY-MM-DD
     return formatted_date
 
-# %% ../nbs/01_runs.ipynb 10
+# %% ../nbs/01_runs.ipynb 14
 def take(l:Iterable, n:int):
     "Take first n entries from a generator"
     return L(islice(l, n))
 
-# %% ../nbs/01_runs.ipynb 11
+# %% ../nbs/01_runs.ipynb 16
+_required_fields = ('id', 'name', 'start_time', 'run_type', 'trace_id') # fields every `Run` needs
+
+def _quote(v):
+    "Format `v` as a value in a LangSmith filter."
+    if isinstance(v, (datetime, date)): v = v.isoformat()
+    return json.dumps(v if isinstance(v, (int, float)) else str(v))
+
+def _and(exprs): return f'and({", ".join(exprs)})' if exprs else None
+
+class RunQuery:
+    "A composable query for runs in LangSmith that is filtered and projected on the server."
+    def __init__(self, 
+                 proj_id:str=None, # Langsmith Project ID, defaults to the `LANGSMITH_PROJECT_ID` env var
+                 run_type:str='chain', # The run type, or None for all run types
+                 root:bool=True, # Only return root runs
+                 errors:bool=False # Include runs that errored
+                ):
+        self.proj_id, self.run_type, self.root, self.errors = proj_id, run_type, root, errors
+        self.filters, self.tree_filters, self.fields = [], [], None
+
+    def _add(self, filters=(), tree_filters=(), fields=None):
+        q = copy.copy(self)
+        q.filters, q.tree_filters = self.filters + list(filters), self.tree_filters + list(tree_filters)
+        if fields is not None: q.fields = fields
+        return q
+
+    def _range(self, field, lo=None, hi=None, fmt=lambda x: x):
+        return [f'{op}({field}, {_quote(fmt(v))})' for op,v in (('gte', lo), ('lte', hi)) if v is not None]
+
+    def where(self, expr:str):
+        "Add a raw LangSmith filter expression such as `'neq(error, null)'`."
+        return self._add([expr])
+
+    def status(self, status:str='success'): return self.where(f'eq(status, {_quote(status)})')
+    def commit(self, commit_id:str): return self.tag(f'commit:{commit_id}')
+    def tag(self, tag:str): return self.where(f'has(tags, {_quote(tag)})')
+    def name(self, name:str): return self.where(f'eq(name, {_quote(name)})')
+
+    def between(self, start=None, end=None):
+        "Runs that started between `start` and `end`, which are ISO formatted strings or datetimes."
+        return self._add(self._range('start_time', start, end))
+
+    def latency(self, min_s:float=None, max_s:float=None):
+        "Runs whose latency in seconds is in a range."
+        return self._add(self._range('latency', min_s, max_s, fmt=lambda x: f'{x}s'))
+
+    def tokens(self, min_tokens:int=None, max_tokens:int=None):
+        "Runs whose total token count is in a range."
+        return self._add(self._range('total_tokens', min_tokens, max_tokens))
+
+    def feedback(self, key:str, min_score:float=None, max_score:float=None):
+        "Runs with feedback `key`, optionally with a score in a range."
+        return self.where(_and([f'eq(feedback_key, {_quote(key)})'] + self._range('feedback_score', min_score, max_score)))
+
+    def metadata(self, key:str, value=None):
+        "Runs with the metadata `key`, optionally set to `value`."
+        exprs = [f'eq(metadata_key, {_quote(key)})'] + ([] if value is None else [f'eq(metadata_value, {_quote(value)})'])
+        return self.where(_and(exprs))
+
+    def model(self, model_name:str):
+        "Runs that contain a call to `model_name`, as recorded in the `ls_model_name` metadata of any run in the trace."
+        return self._add(tree_filters=[f'and(eq(metadata_key, "ls_model_name"), eq(metadata_value, {_quote(model_name)}))'])
+
+    def select(self, *fields:str):
+        "Only return `fields` of each run, plus the fields that every run needs."
+        return self._add(fields=list(dict.fromkeys(_required_fields + fields)))
+
+    @property
+    def filter(self): return _and(self.filters)
+
+    @property
+    def tree_filter(self): return _and(self.tree_filters)
+
+    @property
+    def params(self) -> dict:
+        "The keyword arguments for `langsmith.Client.list_runs`."
+        kw = dict(filter=self.filter, project_id=self.proj_id or check_api_key("LANGSMITH_PROJECT_ID"), run_type=self.run_type)
+        if self.root: kw['execution_order'] = 1 # this gets the root runs
+        if not self.errors: kw['error'] = False
+        if self.tree_filter: kw['tree_filter'] = self.tree_filter
+        if self.fields: kw['select'] = self.fields
+        return kw
+
+    def iter(self, limit:int=None) -> Iterable[langsmith.schemas.Run]:
+        "Lazily iterate over the matching runs, page by page."
+        return get_client().list_runs(limit=limit, **self.params)
+
+    def fetch(self, limit:int=None) -> L:
+        "Get the matching runs."
+        return L(self.iter(limit))
+
+    def __iter__(self): return iter(self.iter())
+
+    def __repr__(self):
+        return f'RunQuery(filter={self.filter!r}, tree_filter={self.tree_filter!r}, select={self.fields!r})'
+
+# %% ../nbs/01_runs.ipynb 18
+def iter_runs_by_commit(commit_id:str=None, # The commit ID to filter by 
+             proj_id:str=None, # Langsmith Project ID
+             only_success=True, # Only include runs that are successfull
+             run_type='chain', # The run type
+             start_dt:str=None, # The start date to filter by
+             end_dt:str=None,    # the end date to filter by
+             after:datetime=None, # Only runs that started at or after this time
+             select:List[str]=None # Only return these fields of each run
+            ) -> Iterable[langsmith.schemas.Run]:
+    "Lazily iterate over runs tagged with a particular commit id (the short version of the SHA) in LangSmith, page by page."
+    q = RunQuery(proj_id, run_type=run_type)
+    if only_success: q = q.status()
+    if commit_id: q = q.commit(commit_id)
+    if start_dt: q = q.between(reformat_date(start_dt), end_dt and reformat_date(end_dt))
+    if after: q = q.between(after)
+    if select: q = q.select(*select)
+    if q.filter: print(f'Fetching runs with this filter: {q.filter}')
+    return q.iter()
+
+def _runs_key(*args, **kwargs):
+    "The cache key of a call to `get_runs_by_commit`, which includes the project that is queried when `proj_id` isn't given."
+    b = inspect.signature(get_runs_by_commit).bind(*args, **kwargs)
+    b.apply_defaults()
+    b.arguments['proj_id'] = b.arguments['proj_id'] or check_api_key("LANGSMITH_PROJECT_ID")
+    return repr(sorted(b.arguments.items()))
+
+@cached(key=_runs_key, expires=True)
 def get_runs_by_commit(commit_id:str=None, # The commit ID to filter by 
              proj_id:str=None, # Langsmith Project ID
              only_success=True, # Only include runs that are successfull
              run_type='chain', # The run type
              start_dt:str=None, # The start date to filter by
              end_dt:str=None,    # the end date to filter by
-             limit:int=None       # The maximum number of runs to return
+             limit:int=None,       # The maximum number of runs to return
+             after:datetime=None # Only runs that started at or after this time
             ):
     "Get all runs tagged with a particular commit id (the short version of the SHA) in LangSmith."
-
-    if start_dt: start_dt=reformat_date(start_dt)
-    if end_dt: end_dt=reformat_date(end_dt)
-    
-    success_query='eq(status, "success")' if only_success else ''
-    commit_query = f'has(tags, "commit:{commit_id}")' if commit_id else ''
-    proj_id = check_api_key("LANGSMITH_PROJECT_ID") if not proj_id else proj_id
-    time_query=''
-    
-    if start_dt:
-        time_query=f'gte(start_time, "{start_dt}")'
-        if end_dt:
-            time_query = f'{time_query}, lte(start_time, "{end_dt}")'
-    
-    queries = ', '.join(L([success_query, commit_query, time_query]).filter())
-    query_string = None if not queries else f'and({queries})'
-    if query_string: print(f'Fetching runs with this filter: {query_string}')
-
-    client = Client()
-    runs = client.list_runs(
-        filter=query_string,
-        project_id=proj_id,
-        execution_order=1, # this gets the root runs
-        error=False,
-        run_type=run_type,
-    )
+    runs = iter_runs_by_commit(commit_id=commit_id, proj_id=proj_id, only_success=only_success, run_type=run_type,
+                               start_dt=start_dt, end_dt=end_dt, after=after)
     return list(runs) if limit is None else take(runs, limit)
 
-# %% ../nbs/01_runs.ipynb 15
-def get_last_child(runs: List[langsmith.schemas.Run]):
-    "Get the child runs for a list of runs."
-    return [client.read_run(r.child_run_ids[-1]) for r in runs if r.child_run_ids]
+# %% ../nbs/01_runs.ipynb 25
+async def aget_runs_by_commit(commit_id:str=None, # The commit ID to filter by 
+             proj_id:str=None, # Langsmith Project ID
+             only_success=True, # Only include runs that are successfull
+             run_type='chain', # The run type
+             start_dt:str=None, # The start date to filter by
+             end_dt:str=None,    # the end date to filter by
+             limit:int=None,       # The maximum number of runs to return
+             after:datetime=None # Only runs that started at or after this time
+            ):
+    "Async version of `get_runs_by_commit`."
+    return await _athread(get_runs_by_commit, commit_id=commit_id, proj_id=proj_id, only_success=only_success, run_type=run_type,
+                          start_dt=start_dt, end_dt=end_dt, limit=limit, after=after)
 
-# %% ../nbs/01_runs.ipynb 18
-def get_recent_runs(start_dt=None, end_dt=None, last_n_days=2, limit=None):
-    "Get recent runs from Langsmith.  If `start_dt` is None gets the `last_n_days`."
-    client = Client()
+# %% ../nbs/01_runs.ipynb 28
+def get_last_child(runs: List[langsmith.schemas.Run], 
+                   chunk_size:int=100, # number of child runs per request
+                   n_workers:int=8 # number of requests to make at once
+                  ) -> List[Union[langsmith.schemas.Run,None]]:
+    "Get the last child run of each run in `runs`, or `None` if it has no children or the child can't be found, fetching them in batches of `chunk_size`."
+    last = [str(r.child_run_ids[-1]) if r.child_run_ids else None for r in runs]
+    child_ids = list(dict.fromkeys(c for c in last if c))
+    chunks = [child_ids[i:i+chunk_size] for i in range(0, len(child_ids), chunk_size)]
+    client = get_client()
+    with ThreadPoolExecutor(max(1, min(n_workers, len(chunks)))) as ex:
+        children = {str(c.id): c for batch in ex.map(lambda ids: list(client.list_runs(run_ids=ids)), chunks) for c in batch}
+    return [children.get(c) for c in last]
+
+# %% ../nbs/01_runs.ipynb 32
+def _date_window(start_dt=None, end_dt=None, last_n_days=2):
+    "The `(start_dt, end_dt)` to search as m/d/Y strings.  If `start_dt` is None uses the `last_n_days` before the latest run."
     if start_dt is None:
-        _runs = client.list_runs(project_id=check_api_key("LANGSMITH_PROJECT_ID"), limit=1)
-        latest_run_dt = first(_runs).start_time
+        latest_run_dt = first(RunQuery(run_type=None, root=False, errors=True).select().iter(limit=1)).start_time
         start_dt_obj = latest_run_dt - timedelta(days=last_n_days)
     else:
         start_dt_obj = datetime.strptime(start_dt, '%m/%d/%Y')
@@ -126,24 +313,60 @@ def get_recent_runs(start_dt=None, end_dt=None, last_n_days=2, limit=None):
         if start_dt is None:
             raise ValueError("end_dt should only be provided if start_dt is provided.")
         end_dt_obj = datetime.strptime(end_dt, '%m/%d/%Y')
-    
-    
-    runs = get_runs_by_commit(start_dt=start_dt_obj.strftime('%m/%d/%Y'),
-                    end_dt=end_dt_obj.strftime('%m/%d/%Y'))
+    return start_dt_obj.strftime('%m/%d/%Y'), end_dt_obj.strftime('%m/%d/%Y')
+
+def get_recent_runs(start_dt=None, end_dt=None, last_n_days=2, limit=None):
+    "Get recent runs from Langsmith.  If `start_dt` is None gets the `last_n_days`."
+    start_dt, end_dt = _date_window(start_dt, end_dt, last_n_days)
+    runs = get_runs_by_commit(start_dt=start_dt, end_dt=end_dt)
     return list(runs) if limit is None else take(runs, limit)
 
-# %% ../nbs/01_runs.ipynb 21
-def get_recent_commit_tags(start_dt=None, end_dt=None, last_n_days=2, return_df=False):
+# %% ../nbs/01_runs.ipynb 35
+def _commit_tag(run): return first(t.split('commit:', 1)[-1] for t in run.tags or [] if t.startswith('commit:'))
+
+def _day_spans(days:List[date]) -> List[Tuple[date,date]]:
+    "Group sorted `days` into `(first, last)` spans of consecutive days."
+    spans = []
+    for d in days:
+        if spans and d - spans[-1][1] == timedelta(days=1): spans[-1] = (spans[-1][0], d)
+        else: spans.append((d, d))
+    return spans
+
+def _scan_commit_counts(proj_id:str, start:date, end:date) -> Counter:
+    "Count runs per `(day, commit)` from `start` to `end` inclusive, downloading only the timestamp and tags of each run."
+    runs = RunQuery(proj_id).status().between(start.isoformat(), (end + timedelta(days=1)).isoformat()).select('start_time', 'tags')
+    return Counter((r.start_time.date(), c) for r in runs if (c := _commit_tag(r)) and start <= r.start_time.date() <= end)
+
+def get_commit_counts(start_dt=None, end_dt=None, last_n_days=2, 
+                      proj_id:str=None, # Langsmith Project ID
+                      rollup:CommitRollup=None, # where to store daily counts, defaults to `rollups.db` next to the cache if caching is enabled
+                      settle:float=3600 # seconds after the end of a day before its counts are stored
+                     ) -> Dict[Tuple[date,str],int]:
+    "The number of successful runs for each `(day, commit)`.  Only days that haven't been rolled up are fetched from LangSmith."
+    start, end = (datetime.strptime(d, '%m/%d/%Y').date() for d in _date_window(start_dt, end_dt, last_n_days))
+    days = [start + timedelta(days=i) for i in range((end - start).days)] # their logic is off lte is really lt
+    if not days: return {}
+    proj_id = proj_id or check_api_key("LANGSMITH_PROJECT_ID")
+    if rollup is None and get_cache() is not None: rollup = CommitRollup(get_cache().path.with_name('rollups.db'))
+    if rollup is None: return _scan_commit_counts(proj_id, days[0], days[-1])
+    settled = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=settle)
+    counts = rollup.counts(proj_id, days[0], days[-1])
+    for first_day, last_day in _day_spans(rollup.missing(proj_id, days)):
+        fresh = _scan_commit_counts(proj_id, first_day, last_day)
+        counts.update(fresh)
+        for i in range((last_day - first_day).days + 1):
+            d = first_day + timedelta(days=i)
+            if datetime(d.year, d.month, d.day) + timedelta(days=1) <= settled:
+                rollup.add(proj_id, d, {c: n for (day, c), n in fresh.items() if day == d})
+    return counts
+
+def get_recent_commit_tags(start_dt=None, end_dt=None, last_n_days=2, return_df=False, rollup:CommitRollup=None):
     "Print a table of recent commit SHAs from Langsmith along with their counts that you can filter on"
-    runs = L(get_recent_runs(start_dt=start_dt, end_dt=end_dt, last_n_days=last_n_days))
-    data = runs.map(lambda x: {'start_dt': x.start_time.strftime('%m/%d/%Y'),
-                        'commit': first([t.split('commit:')[-1] for t in x.tags if t.startswith('commit:')])
-                       }
-            )
+    counts = get_commit_counts(start_dt=start_dt, end_dt=end_dt, last_n_days=last_n_days, rollup=rollup)
+    data = [(d.strftime('%m/%d/%Y'), c, n) for (d, c), n in sorted(counts.items(), key=lambda x: (x[0][0], x[1]), reverse=True)]
     if data:
-        df = pd.DataFrame(data)
-        agg = df.groupby(['start_dt']).value_counts().reset_index()
-        agg = agg.rename(columns={0: 'count'}).sort_values(by=['start_dt', 'count'], ascending=False)
+        import pandas as pd
+        agg = pd.DataFrame(data, columns=['start_dt', 'commit', 'count'])
         if not return_df:
             print(agg.to_markdown(index=False))
         else:
@@ -153,12 +376,12 @@ def get_recent_commit_tags(start_dt=None, end_dt=None, last_n_days=2, return_df=
         print(f'No commits found for {start_dt} - {end_dt}')
         return None
 
-# %% ../nbs/01_runs.ipynb 29
+# %% ../nbs/01_runs.ipynb 44
 def _ischatopenai(run): 
     if run.name != 'ChatOpenAI':
         raise TypeError(f'Run: {run.id} is of type `{run.name}`, but can only parse `ChatOpenAI` runs.')
 
-# %% ../nbs/01_runs.ipynb 30
+# %% ../nbs/01_runs.ipynb 45
 def get_params(run:langsmith.schemas.Run) -> dict:
     "Get important parameters from a run logged in LangSmith"
     if 'invocation_params' in run.extra:
@@ -172,7 +395,7 @@ def get_params(run:langsmith.schemas.Run) -> dict:
                    )
     else: return {}    
 
-# %% ../nbs/01_runs.ipynb 32
+# %% ../nbs/01_runs.ipynb 47
 def get_functions(run:langsmith.schemas.Run) -> List[dict]:
     "Get function definitions from a LangSmith run."
     if 'invocation_params' in run.extra:
@@ -180,14 +403,33 @@ def get_functions(run:langsmith.schemas.Run) -> List[dict]:
         return p.get('functions', [])
     else: return []
 
-# %% ../nbs/01_runs.ipynb 35
+# %% ../nbs/01_runs.ipynb 50
+def _feedback_dict(f:langsmith.schemas.Feedback) -> dict:
+    return dict(key=f.key, score=f.score, value=f.value, comment=f.comment, correction=f.correction)
+
+@cached(key=lambda run: run.id, expires=True)
 def get_feedback(run:langsmith.schemas.Run) -> list:
     "Get feedback from a run if exists."
-    raw = L(client.list_feedback(run_ids=[run.id]))
-    return list(raw.map(lambda x: dict(key=x.key, 
-                                       score=x.score, 
-                                       value=x.value, 
-                                       comment=x.comment, 
-                                       correction=x.correction)
-                       )
-               )
+    raw = L(get_client().list_feedback(run_ids=[run.id]))
+    return list(raw.map(_feedback_dict))
+
+async def aget_feedback(run:langsmith.schemas.Run) -> list:
+    "Async version of `get_feedback`."
+    return await _athread(get_feedback, run)
+
+# %% ../nbs/01_runs.ipynb 53
+def get_bulk_feedback(run_ids:Iterable, # run ids (or runs) to get feedback for
+                      chunk_size:int=100 # number of runs per request
+                     ) -> Dict[str, list]:
+    "Get feedback for many runs with one request per `chunk_size` runs, as a dict of run id -> feedback."
+    run_ids, cache = L(run_ids).map(lambda r: str(getattr(r, 'id', r))).unique(), get_cache()
+    _key = lambda r: f'get_feedback:{r}' # shares cache entries with `get_feedback`
+    feedback = {r: cache.get(_key(r)) if cache is not None else None for r in run_ids}
+    todo = [r for r,v in feedback.items() if v is None]
+    feedback.update({r:[] for r in todo})
+    for i in range(0, len(todo), chunk_size):
+        for f in get_client().list_feedback(run_ids=todo[i:i+chunk_size]):
+            feedback[str(f.run_id)].append(_feedback_dict(f))
+    if cache is not None:
+        for r in todo: cache.set(_key(r), feedback[r], ttl=cache.ttl)
+    return feedback
@@ -0,0 +1,95 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/11_search.ipynb.
+
+# %% auto 0
+__all__ = ['RecordIndex']
+
+# %% ../nbs/11_search.ipynb 3
+import sqlite3, threading
+from pathlib import Path
+from typing import Iterable, List, Union
+
+from .transform import flatten_runs
+from .chatrecord import ChatRecord, ChatRecordSet
+
+# %% ../nbs/11_search.ipynb 6
+_params = ['param_n', 'param_top_p', 'param_temp', 'param_presence_penalty', 'param_freq_penalty']
+
+def _fields(r) -> list:
+    "The `(field, value)` pairs of a `ChatRecord` that can be searched for exactly."
+    run = r.child_run
+    res = {('function', m['function_call']['name']) for m in run.inputs + [run.output] if m.get('function_call')}
+    res |= {('tag', t) for t in r.tags or []}
+    res |= {('feedback_key', k) for k in (r.feedback_keys or [f.get('key') for f in r.feedback or []]) if k}
+    if r.param_model_name: res.add(('model', r.param_model_name))
+    res |= {(p, str(getattr(r, p))) for p in _params if getattr(r, p) is not None}
+    return sorted(res)
+
+class RecordIndex:
+    "A SQLite index of the messages, function calls, tags, feedback keys and params of the records in a `ChatRecordSet`."
+    def __init__(self, 
+                 path:Union[str,Path]=':memory:' # where to store the index, which is kept in memory by default
+                ):
+        self.path, self._lock = path, threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('CREATE TABLE IF NOT EXISTS records (idx INTEGER PRIMARY KEY, child_run_id TEXT)')
+        self._db.execute('CREATE VIRTUAL TABLE IF NOT EXISTS messages USING fts5(input, output)')
+        self._db.execute('''CREATE TABLE IF NOT EXISTS fields (field TEXT, value TEXT, idx INTEGER, 
+                            PRIMARY KEY (field, value, idx)) WITHOUT ROWID''')
+
+    def __len__(self): return self._db.execute('SELECT COUNT(*) FROM records').fetchone()[0]
+
+    def update(self, 
+               records:Union[ChatRecordSet,List[ChatRecord]], # the records to index
+               n_workers:int=0 # number of processes flattening the messages of new records
+              ) -> int:
+        "Index the records that were added to `records` since the last update, and return how many there were."
+        with self._lock:
+            n = len(self)
+            if n:
+                last, = self._db.execute('SELECT child_run_id FROM records WHERE idx=?', (n-1,)).fetchone()
+                if n > len(records) or records[n-1].child_run_id != last: 
+                    raise ValueError('The index was built from different records, make a new `RecordIndex` for them.')
+            new = [records[i] for i in range(n, len(records))]
+            flat_in, flat_out = flatten_runs(new, n_workers=n_workers)
+            self._db.execute('BEGIN')
+            self._db.executemany('INSERT INTO records VALUES (?,?)', [(n+i, r.child_run_id) for i,r in enumerate(new)])
+            self._db.executemany('INSERT INTO messages (rowid, input, output) VALUES (?,?,?)', 
+                                 [(n+i, fi, fo) for i,(fi,fo) in enumerate(zip(flat_in, flat_out))])
+            self._db.executemany('INSERT INTO fields VALUES (?,?,?)', [(f, v, n+i) for i,r in enumerate(new) for f,v in _fields(r)])
+            self._db.execute('COMMIT')
+            return len(new)
+
+    def search(self, 
+               query:str=None, # an FTS5 query on the messages, like `'"reset password"'`, `'output: sorry'` or `'refund OR return'`
+               function:str=None, # the name of a function the model called
+               tag:str=None, # a tag of the record
+               feedback_key:str=None, # a feedback key of the record
+               model:str=None, # the name of the model
+               limit:int=None, # the maximum number of indices to return
+               **params # other params to match, like `param_temp=0`
+              ) -> List[int]:
+        "The positions of the records that match all of the arguments, in order."
+        unknown = set(params) - set(_params)
+        if unknown: raise TypeError(f'Unknown fields: {", ".join(sorted(unknown))}')
+        conds, args = [], []
+        if query is not None:
+            conds.append('idx IN (SELECT rowid FROM messages WHERE messages MATCH ?)')
+            args.append(query)
+        fields = dict(function=function, tag=tag, feedback_key=feedback_key, model=model, **params)
+        for f,v in fields.items():
+            if v is None: continue
+            conds.append('idx IN (SELECT idx FROM fields WHERE field=? AND value=?)')
+            args += [f, str(v)]
+        sql = 'SELECT idx FROM records' + (f' WHERE {" AND ".join(conds)}' if conds else '') + ' ORDER BY idx'
+        if limit is not None: 
+            sql += ' LIMIT ?'
+            args.append(limit)
+        with self._lock: return [i for i, in self._db.execute(sql, args)]
+
+    def values(self, field:str) -> dict:
+        "The number of records with each value of `field`, for example the functions that were called."
+        with self._lock:
+            rows = self._db.execute('SELECT value, COUNT(*) FROM fields WHERE field=? GROUP BY value ORDER BY COUNT(*) DESC', (field,))
+            return dict(rows.fetchall())
+
+    def __repr__(self): return f'RecordIndex({str(self.path)!r}, {len(self)} records)'
@@ -1,11 +1,13 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/04_shiny.ipynb.
 
 # %% auto 0
-__all__ = ['render_input_chat', 'render_funcs', 'render_llm_output', 'invoke_later']
+__all__ = ['render_input_chat', 'render_funcs', 'render_llm_output', 'invoke_later', 'ReviewStore']
 
 # %% ../nbs/04_shiny.ipynb 3
-import os, json
+import os, json, time, sqlite3, threading
+from pathlib import Path
 from pprint import pformat
+from typing import Union, Iterable, List, Dict
 from .transform import RunData
 from shiny import module, ui, render, reactive
 import shiny.experimental as x
@@ -94,3 +96,76 @@ def invoke_later(delaySecs:int, callback:callable):
             callback()
             await reactive.flush()
     asyncio.create_task(delay_task())
+
+# %% ../nbs/04_shiny.ipynb 30
+class ReviewStore:
+    "An append-only log of the reviews of records, stored in SQLite."
+    def __init__(self, 
+                 path:Union[str,Path], # the SQLite file to store the reviews in, which is created if it doesn't exist
+                 compact_every:int=10_000 # compact the log after this many reviews, or never if `None`
+                ):
+        self.path, self.compact_every, self._lock, self._n = Path(path), compact_every, threading.RLock(), 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute('''CREATE TABLE IF NOT EXISTS reviews (seq INTEGER PRIMARY KEY, record_id TEXT, status TEXT, 
+                            edited_output TEXT, timestamp REAL)''')
+        self._db.execute('CREATE INDEX IF NOT EXISTS reviews_record ON reviews (record_id, seq)')
+
+    def __len__(self): return self._db.execute('SELECT COUNT(*) FROM reviews').fetchone()[0]
+
+    def record(self, 
+               record_id:str, # the id of the record, like its `child_run_id`
+               status:str, # `Accepted`, `Rejected` or `Pending`
+               edited_output:str=None # the output after the reviewer's edits
+              ):
+        "Append a review of `record_id`."
+        with self._lock:
+            self._db.execute('INSERT INTO reviews (record_id, status, edited_output, timestamp) VALUES (?,?,?,?)', 
+                             (str(record_id), status, edited_output, time.time()))
+            self._n += 1
+            if self.compact_every and self._n >= self.compact_every: self.compact()
+
+    def compact(self):
+        "Drop every review that was superseded by a later review of the same record."
+        with self._lock:
+            self._db.execute('DELETE FROM reviews WHERE seq NOT IN (SELECT MAX(seq) FROM reviews GROUP BY record_id)')
+            self._db.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            self._n = 0
+
+    def latest(self) -> Dict[str,dict]:
+        "The latest review of each record."
+        with self._lock:
+            rows = self._db.execute('''SELECT record_id, status, edited_output, timestamp FROM reviews 
+                                       WHERE seq IN (SELECT MAX(seq) FROM reviews GROUP BY record_id)''').fetchall()
+        return {r: dict(status=s, edited_output=o, timestamp=t) for r,s,o,t in rows}
+
+    def history(self, record_id:str) -> List[dict]:
+        "Every review of `record_id` that hasn't been compacted away, oldest first."
+        with self._lock:
+            rows = self._db.execute('SELECT status, edited_output, timestamp FROM reviews WHERE record_id=? ORDER BY seq', 
+                                    (str(record_id),)).fetchall()
+        return [dict(status=s, edited_output=o, timestamp=t) for s,o,t in rows]
+
+    def apply(self, 
+              df, # a `DataFrame` of records with `id_col`, `child_run` and `status` columns
+              id_col:str='child_run_id' # the column with the ids of the records
+             ):
+        "Set the `status` and edited outputs of the records in `df` from their latest reviews."
+        latest = self.latest()
+        for i, rid, run in zip(df.index, df[id_col].astype(str), df['child_run']):
+            review = latest.get(rid)
+            if review is None: continue
+            df.at[i, 'status'] = review['status']
+            if review['edited_output'] is not None: run.output['content'] = review['edited_output']
+        return df
+
+    def resume(self, 
+               ids:Iterable[str] # the ids of the records, in the order they are reviewed
+              ) -> int:
+        "The position of the first record in `ids` that hasn't been accepted or rejected, or `0` if they all have."
+        latest = self.latest()
+        return next((i for i,r in enumerate(ids) if latest.get(str(r), {}).get('status', 'Pending') == 'Pending'), 0)
+
+    def __repr__(self): return f'ReviewStore({str(self.path)!r})'
@@ -0,0 +1,126 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/05_test_utils.ipynb.
+
+# %% auto 0
+__all__ = ['fake_chat_run', 'fake_trace', 'fake_feedback', 'FakeClient']
+
+# %% ../nbs/05_test_utils.ipynb 3
+import uuid, re
+from datetime import datetime, timedelta
+from collections import Counter
+from typing import List
+
+from langsmith.schemas import Run, Feedback
+from langsmith.utils import LangSmithNotFoundError
+from langchain.adapters import openai as adapt
+from langchain.load import dumpd
+from fastcore.foundation import L
+
+# %% ../nbs/05_test_utils.ipynb 6
+def fake_chat_run(inputs:List[dict]=None, # OpenAI style input messages
+                  output:dict=None, # OpenAI style output message
+                  funcs:List[dict]=None, # function definitions
+                  model:str='gpt-3.5-turbo', # the model name in the invocation params
+                  start_time:datetime=None, # when the run started
+                  **kwargs # other fields of `Run`, for example `parent_run_id`
+                 ) -> Run:
+    "Make a `ChatOpenAI` run like the ones LangChain logs to LangSmith."
+    inputs = inputs or [{'role': 'system', 'content': 'You are a helpful assistant.'}, {'role': 'user', 'content': 'Hello'}]
+    output = output or {'role': 'assistant', 'content': 'Hi! How can I help?'}
+    start_time = start_time or datetime(2023, 10, 4)
+    params = dict(model=model, n=1, temperature=0, top_p=1, presence_penalty=0, frequency_penalty=0)
+    if funcs: params['functions'] = funcs
+    _msg = lambda m: dumpd(adapt.convert_dict_to_message(m))
+    return Run(id=uuid.uuid4(), name='ChatOpenAI', run_type='llm', status='success',
+               start_time=start_time, end_time=start_time + timedelta(seconds=1),
+               inputs={'messages': [_msg(m) for m in inputs]},
+               outputs={'generations': [{'message': _msg(output)}]},
+               extra={'invocation_params': params},
+               prompt_tokens=10, completion_tokens=5, total_tokens=15, **kwargs)
+
+# %% ../nbs/05_test_utils.ipynb 7
+def fake_trace(chat_runs:List[Run]=None, # `ChatOpenAI` runs, defaults to a single `fake_chat_run`
+               tags:List[str]=None, # tags for the root run, for example `commit:<sha>`
+               start_time:datetime=None, # when the trace started
+               agent:bool=False, # nest the chat runs inside a `RunnableAgent`
+               name:str='AgentExecutor' # the name of the root run
+              ) -> Run:
+    "Make a root run with its tree of `child_runs` loaded."
+    root_id = uuid.uuid4()
+    start_time = start_time or datetime(2023, 10, 4)
+    chat_runs = L(chat_runs or [fake_chat_run(start_time=start_time)])
+    if agent:
+        agent_id = uuid.uuid4()
+        chat_runs = chat_runs.map(lambda r: r.copy(update=dict(parent_run_id=agent_id, trace_id=root_id)))
+        children = [Run(id=agent_id, name='RunnableAgent', run_type='chain', start_time=start_time, 
+                        end_time=start_time + timedelta(seconds=1), trace_id=root_id,
+                        parent_run_id=root_id, child_run_ids=list(chat_runs.attrgot('id')), child_runs=list(chat_runs))]
+    else: 
+        children = list(chat_runs.map(lambda r: r.copy(update=dict(parent_run_id=root_id, trace_id=root_id))))
+    descendants = []
+    for c in children: descendants += [c.id] + [g.id for g in c.child_runs or []]
+    return Run(id=root_id, name=name, run_type='chain', status='success', 
+               start_time=start_time, end_time=start_time + timedelta(seconds=1),
+               tags=tags or [], inputs={'input': 'Hello'}, outputs={'output': 'Hi! How can I help?'},
+               child_run_ids=descendants, child_runs=children)
+
+# %% ../nbs/05_test_utils.ipynb 9
+def fake_feedback(run:Run, key:str, score=None, comment:str=None, **kwargs) -> Feedback:
+    "Make a piece of `Feedback` attached to `run`."
+    now = datetime.now()
+    return Feedback(id=uuid.uuid4(), run_id=run.id, key=key, score=score, comment=comment, 
+                    created_at=now, modified_at=now, **kwargs)
+
+# %% ../nbs/05_test_utils.ipynb 10
+_required = {'id', 'name', 'start_time', 'run_type', 'trace_id'}
+
+def _matches(run:Run, query:str=None) -> bool:
+    "Whether `run` matches a LangSmith filter `query` that combines comparisons with `and`."
+    def _cmp(op, field, val):
+        attr = getattr(run, field)
+        if op == 'has': return val in (attr or [])
+        if field.endswith('_time'): val = datetime.fromisoformat(val)
+        elif not isinstance(attr, str): val = type(attr)(val)
+        return dict(eq=attr==val, neq=attr!=val, gt=attr>val, gte=attr>=val, lt=attr<val, lte=attr<=val)[op]
+    return all(_cmp(*c) for c in re.findall(r'(\w+)\((\w+), "([^"]*)"\)', query or ''))
+
+# %% ../nbs/05_test_utils.ipynb 12
+class FakeClient:
+    "An in-memory stand-in for `langsmith.Client` that counts the requests made to it."
+    def __init__(self, 
+                 traces:List[Run]=(), # root runs made with `fake_trace`
+                 feedback:List[Feedback]=() # feedback made with `fake_feedback`
+                ):
+        self.traces, self.feedback, self.calls, self._runs = list(traces), list(feedback), Counter(), {}
+        for t in self.traces: self._index(t)
+
+    def _index(self, r):
+        self._runs[str(r.id)] = r
+        for c in r.child_runs or []: self._index(c)
+
+    def add_traces(self, traces:List[Run]):
+        "Add new root runs, as if they had just been logged."
+        self.traces += traces
+        for t in traces: self._index(t)
+
+    def read_run(self, run_id, load_child_runs:bool=False) -> Run:
+        self.calls['read_run'] += 1
+        if str(run_id) not in self._runs: raise LangSmithNotFoundError(f'Run {run_id} not found') # like `langsmith.Client`
+        run = self._runs[str(run_id)]
+        return run.copy(deep=True) if load_child_runs else run.copy(update=dict(child_runs=None))
+
+    def list_runs(self, limit:int=None, filter:str=None, **kwargs):
+        "Lazily yields the root runs, or the runs in `run_ids`, that match `filter`, most recent first.  The last query is stored in `list_runs_kwargs`."
+        self.calls['list_runs'] += 1
+        self.list_runs_kwargs = dict(filter=filter, **kwargs)
+        run_ids = kwargs.get('run_ids')
+        runs = self.traces if run_ids is None else [self._runs[str(i)] for i in run_ids if str(i) in self._runs]
+        runs = [r for r in runs if _matches(r, filter)]
+        runs = sorted(runs, key=lambda r: r.start_time, reverse=True)[:limit]
+        select = kwargs.get('select')
+        drop = {k: None for k in Run.__fields__ if select and k not in select and k not in _required}
+        for r in runs: yield r.copy(update={'child_runs': None, **drop})
+
+    def list_feedback(self, run_ids=None, **kwargs):
+        self.calls['list_feedback'] += 1
+        run_ids = {str(r) for r in run_ids or []}
+        return (f for f in self.feedback if not run_ids or str(f.run_id) in run_ids)
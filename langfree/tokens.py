@@ -0,0 +1,130 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/10_tokens.ipynb.
+
+# %% auto 0
+__all__ = ['prices', 'TokenCounter', 'model_price', 'token_index', 'cost_summary', 'iter_within_limit']
+
+# %% ../nbs/10_tokens.ipynb 3
+import json, hashlib
+from datetime import datetime
+from itertools import repeat
+from typing import Iterable, Callable, List, Dict, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from .transform import _count_tokens, _example_tokens, _picklable
+from .dedup import _msg_dict
+from .runs import _commit_tag
+
+# %% ../nbs/10_tokens.ipynb 6
+def _item_tokens(o:Union[dict,list], count:Callable=_count_tokens) -> int:
+    "Tokens in a message of a fine-tuning example, or in its list of function definitions."
+    if isinstance(o, list): return count(json.dumps(o))
+    return 3 + sum(count(v if isinstance(v, str) else json.dumps(v)) + (k == "name") for k,v in o.items())
+
+def _count_chunk(args) -> List[int]:
+    items, count = args
+    return [_item_tokens(o, count) for o in items]
+
+def _hash(o) -> bytes: return hashlib.blake2b(json.dumps(o, sort_keys=True).encode(), digest_size=16).digest()
+
+class TokenCounter:
+    "Counts the tokens in fine-tuning examples, caching the count of each distinct message by a hash of its content."
+    def __init__(self, 
+                 count_tokens:Callable=None, # counts the tokens in a string, defaults to tiktoken's `cl100k_base`
+                 n_workers:int=0, # number of processes tokenizing new messages, 0 tokenizes them in this process
+                 chunk_size:int=1000 # number of messages sent to a process at a time
+                ):
+        self.count, self.n_workers, self.chunk_size = count_tokens or _count_tokens, n_workers, chunk_size
+        self._cache = {} # hash of a message -> its tokens
+        self.hits, self.misses = 0, 0
+
+    def messages(self, msgs:List[Union[dict,list]]) -> np.ndarray:
+        "The tokens in each of `msgs`, which are messages or lists of functions, only counting the ones that haven't been seen."
+        keys = [_hash(m) for m in msgs]
+        todo = {}
+        for k,m in zip(keys, msgs):
+            if k not in self._cache: todo.setdefault(k, m)
+        self.misses += len(todo)
+        self.hits += len(keys) - len(todo)
+        new = list(todo.values())
+        chunks = [(new[i:i+self.chunk_size], self.count) for i in range(0, len(new), self.chunk_size)]
+        if self.n_workers and len(chunks) > 1 and _picklable(self.count):
+            with ProcessPoolExecutor(self.n_workers) as ex: counts = list(ex.map(_count_chunk, chunks))
+        else: counts = map(_count_chunk, chunks)
+        self._cache.update(zip(todo, (n for c in counts for n in c)))
+        return np.fromiter((self._cache[k] for k in keys), dtype=np.int64, count=len(keys))
+
+    def examples(self, items:Iterable) -> Dict[str,np.ndarray]:
+        "The `prompt`, `completion` and `total` tokens in the `to_msg_dict` of each of `items`, where the completion is the final assistant message."
+        flat, owner, is_completion, n = [], [], [], 0
+        for i,o in enumerate(items):
+            ex, n = _msg_dict(o), i+1
+            msgs = ex.get('messages') or []
+            for j,m in enumerate(msgs):
+                flat.append(m); owner.append(i); is_completion.append(j == len(msgs)-1 and m.get('role') == 'assistant')
+            if ex.get('functions'): 
+                flat.append(ex['functions']); owner.append(i); is_completion.append(False)
+        counts, owner, is_completion = self.messages(flat), np.array(owner, dtype=np.int64), np.array(is_completion, dtype=bool)
+        completion = np.bincount(owner[is_completion], weights=counts[is_completion], minlength=n).astype(np.int64)
+        prompt = 3 + np.bincount(owner[~is_completion], weights=counts[~is_completion], minlength=n).astype(np.int64)
+        return dict(prompt=prompt, completion=completion, total=prompt + completion)
+
+    def __repr__(self): return f'TokenCounter(messages={len(self._cache)}, hits={self.hits}, misses={self.misses})'
+
+# %% ../nbs/10_tokens.ipynb 11
+prices = {'gpt-3.5-turbo': (0.5, 1.5), 'gpt-3.5-turbo-16k': (3, 4), 'gpt-4': (30, 60), 'gpt-4-32k': (60, 120), 
+          'gpt-4-turbo': (10, 30), 'gpt-4-1106': (10, 30), 'gpt-4-0125': (10, 30), 'gpt-4o': (5, 15), 'gpt-4o-mini': (0.15, 0.6)} # USD per 1M prompt, completion tokens, OpenAI's list prices as of July 2024
+
+def model_price(model:str, prices:Dict[str,Tuple[float,float]]=prices) -> Union[Tuple[float,float],None]:
+    "The `(prompt, completion)` price per 1M tokens of `model`, from the longest matching prefix in `prices`."
+    if not model: return None
+    name = model.split(':')[1] if model.startswith('ft:') else model
+    keys = [k for k in prices if name.startswith(k)]
+    return prices[max(keys, key=len)] if keys else None
+
+# %% ../nbs/10_tokens.ipynb 13
+def _day(start_dt:str): return datetime.strptime(start_dt, '%m/%d/%Y').date() if start_dt else None
+
+def token_index(records:Iterable, # `ChatRecord`s like a `ChatRecordSet`, or `RunData`
+                max_tokens:int=4096, # the fine-tuning context limit
+                counter:TokenCounter=None, # counts the tokens in each record, and caches them
+                prices:Dict[str,Tuple[float,float]]=prices # USD per 1M prompt and completion tokens of each model
+               ):
+    "A table of the tokens in each record and what it cost.  Costs use the tokens LangSmith reported, or the counted tokens if there are none."
+    import pandas as pd
+    records = list(records)
+    counts = (counter or TokenCounter()).examples(records)
+    _get = lambda k: [getattr(r, k, None) for r in records]
+    df = pd.DataFrame(dict(child_run_id=[getattr(r, 'child_run_id', None) or getattr(r, 'run_id', None) for r in records],
+                           commit=[_commit_tag(r) if hasattr(r, 'tags') else None for r in records],
+                           model=_get('param_model_name'), day=[_day(d) for d in _get('start_dt')],
+                           reported_prompt_tokens=pd.array(_get('prompt_tokens'), dtype='Int64'),
+                           reported_completion_tokens=pd.array(_get('completion_tokens'), dtype='Int64'),
+                           prompt_tokens=counts['prompt'], completion_tokens=counts['completion'], total_tokens=counts['total']))
+    df['too_long'] = df.total_tokens > max_tokens
+    price = [model_price(m, prices) or (np.nan, np.nan) for m in df.model]
+    prompt = df.reported_prompt_tokens.fillna(df.prompt_tokens).astype(float)
+    completion = df.reported_completion_tokens.fillna(df.completion_tokens).astype(float)
+    df['cost'] = (prompt*[p for p,_ in price] + completion*[c for _,c in price])/1e6
+    return df
+
+def cost_summary(index, # a `DataFrame` made with `token_index`
+                 by:Iterable[str]=('commit', 'model', 'day') # the columns to group by
+                ):
+    "The number of records, their tokens, the number over the context limit, and their cost for each group in `by`."
+    return (index.groupby(list(by), dropna=False)
+                 .agg(n_records=('total_tokens', 'size'), total_tokens=('total_tokens', 'sum'), 
+                      n_too_long=('too_long', 'sum'), cost=('cost', lambda c: c.sum(min_count=1)))
+                 .reset_index().sort_values('cost', ascending=False, ignore_index=True))
+
+# %% ../nbs/10_tokens.ipynb 14
+def iter_within_limit(items:Iterable, # `ChatRecord`s, `RunData` or dicts made with `to_msg_dict`
+                      max_tokens:int=4096, # the fine-tuning context limit
+                      counter:TokenCounter=None, # counts the tokens in each item, and caches them
+                     ) -> Iterable:
+    "Lazily yield the `items` whose `to_msg_dict` fits in `max_tokens`, and report how many didn't."
+    counter, n_skipped = counter or TokenCounter(), 0
+    for o in items:
+        if counter.examples([o])['total'][0] <= max_tokens: yield o
+        else: n_skipped += 1
+    if n_skipped: print(f'Skipped {n_skipped} examples over {max_tokens} tokens.')
@@ -1,19 +1,23 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/02_transform.ipynb.
 
 # %% auto 0
-__all__ = ['client', 'chat', 'fetch_run_componets', 'RunData', 'write_to_jsonl', 'validate_jsonl']
+__all__ = ['chat', 'fetch_run_componets', 'afetch_run_componets', 'RunData', 'flatten_runs', 'write_to_jsonl', 'JsonlReport',
+           'validate_jsonl']
 
 # %% ../nbs/02_transform.ipynb 3
-import os, copy, json
-import openai, langsmith
-from typing import List, Callable
-from random import shuffle
+import os, copy, json, gzip, random, pickle, tempfile, warnings
+import langsmith.schemas
+from typing import List, Callable, Iterable, Dict, Tuple
+from array import array
+from itertools import repeat
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 from collections import defaultdict
 
-from .runs import _temp_env_var, Client, _ischatopenai
+from .runs import _temp_env_var, get_client, _ischatopenai, _athread
+from .cache import cached
 from pydantic import BaseModel
-from langchain.adapters import openai as adapt
-from langchain.load import load
 from fastcore.foundation import L
 from tenacity import (
     retry,
@@ -23,20 +27,25 @@ from tenacity import (
 
 
 # %% ../nbs/02_transform.ipynb 5
-client = openai.OpenAI()
+@lru_cache(maxsize=None)
+def _openai_client():
+    "The OpenAI client, created the first time `chat` is called."
+    import openai
+    return openai.OpenAI()
 
 # %% ../nbs/02_transform.ipynb 6
 @retry(wait=wait_random_exponential(min=1, max=60), stop=stop_after_attempt(6))
 def chat(**kwargs):
     "A wrapper around `openai.ChatCompletion` that has automatic retries." 
+    client = _openai_client()
     client.api_key = os.environ['OPENAI_API_KEY']
     return client.chat.completions.create(**kwargs)
 
 # %% ../nbs/02_transform.ipynb 9
-def fetch_run_componets(run_id:str):
-    "Return the `inputs`, `output` and `funcs` for a run of type `ChatOpenAI`."
-    client = langsmith.Client()
-    run = client.read_run(run_id)
+def _run_componets(run:langsmith.schemas.Run):
+    "Return the `inputs`, `output` and `funcs` for a `ChatOpenAI` run that has already been fetched."
+    from langchain.adapters import openai as adapt
+    from langchain.load import load
     _ischatopenai(run)
     output = adapt.convert_message_to_dict(load(run.outputs['generations'][0]['message']))
     inputs = [adapt.convert_message_to_dict(load(m)) for m in run.inputs['messages']]
@@ -48,7 +57,40 @@ def fetch_run_componets(run_id:str):
     funcs = params.get("functions", [])
     return inputs, output, funcs
 
-# %% ../nbs/02_transform.ipynb 12
+@cached(key=lambda run_id: run_id)
+def fetch_run_componets(run_id:str):
+    "Return the `inputs`, `output` and `funcs` for a run of type `ChatOpenAI`."
+    return _run_componets(get_client().read_run(run_id))
+
+async def afetch_run_componets(run_id:str):
+    "Async version of `fetch_run_componets`."
+    return await _athread(fetch_run_componets, run_id)
+
+# %% ../nbs/02_transform.ipynb 13
+def _msg_key(m:dict) -> tuple:
+    "The parts of a message that its markdown depends on.  Edits to a message, even in place, change its key."
+    call = m.get('function_call') or {}
+    return (m['role'], m.get('content', ''), 'function_call' in m, call.get('name'), call.get('arguments'))
+
+@lru_cache(maxsize=2**16)
+def _format_call(name:str, arguments:str) -> str:
+    args = json.loads(arguments)
+    return f"{name}({', '.join(f'{k}={v}' for k,v in args.items())})"
+
+@lru_cache(maxsize=4096)
+def _flatten_msgs(keys:tuple) -> str:
+    "Markdown for the messages with `keys`, cached so that views of the same messages are only built once."
+    parts = []
+    for role, content, has_call, name, arguments in keys:
+        if role == 'assistant' and has_call: role += ' - function call'
+        if role == 'function': role += ' - results'
+        parts.append(f"### {role.title()}\n\n")
+        if content: parts.append(content + "\n")
+        elif has_call: parts.append(_format_call(name, arguments) + "\n")
+        parts.append("\n")
+    return ''.join(parts)
+
+# %% ../nbs/02_transform.ipynb 14
 class RunData(BaseModel):
     "Key components of a run from LangSmith"
     inputs:List[dict]
@@ -62,6 +104,12 @@ class RunData(BaseModel):
         inputs, output, funcs = fetch_run_componets(run_id)
         return cls(inputs=inputs, output=output, funcs=funcs, run_id=run_id)
 
+    @classmethod
+    def from_run(cls, run:langsmith.schemas.Run):
+        "Create a `RunData` object from a `ChatOpenAI` run you have already fetched, without another request to LangSmith."
+        inputs, output, funcs = _run_componets(run)
+        return cls(inputs=inputs, output=output, funcs=funcs, run_id=str(run.id))
+
     def to_msg_dict(self):
         "Transform the instance into a dict in the format that can be used for OpenAI fine-tuning."
         msgs = self.inputs + [self.output]
@@ -90,88 +138,229 @@ class RunData(BaseModel):
     @classmethod	
     def _flatten_data(cls, data):
         "Produce a flattened view of the data as human readable Markdown."
-        md_str = ""
-        for item in data:
-            # Heading
-            role = item['role']
-            if role == 'assistant' and 'function_call' in item:
-                role += ' - function call'
-            if role == 'function':
-                role += ' - results'
-            
-            md_str += f"### {role.title()}\n\n"
-
-            content = item.get('content', '')
-            if content: md_str += content + "\n"
-                
-            elif 'function_call' in item:
-                func_name = item['function_call']['name']
-                args = json.loads(item['function_call']['arguments'])
-                formatted_args = ', '.join([f"{k}={v}" for k, v in args.items()])
-                md_str += f"{func_name}({formatted_args})\n"
-            md_str += "\n"
-        return md_str
-
-# %% ../nbs/02_transform.ipynb 25
-def write_to_jsonl(data_list:List[RunData], filename:str):
-    """
-    Writes a list of dictionaries to a .jsonl file.
-    
-    Parameters:
-    - data_list (list of `RunData`): The data to be written.
-    - filename (str): The name of the output file.
-    """
-    shuffle(data_list)
-    with open(filename, 'w') as f:
-        for entry in data_list:
-            f.write(f"{entry.to_json()}\n")
-
-# %% ../nbs/02_transform.ipynb 28
-def validate_jsonl(fname):
-    "Code is modified from https://cookbook.openai.com/examples/chat_finetuning_data_prep, but updated for function calling."
-    # Load the dataset
-    with open(fname, 'r', encoding='utf-8') as f:
-        dataset = [json.loads(line) for line in f]
-
-    # Initial dataset stats
-    print("Num examples:", len(dataset))
-        
-    # Format error checks
-    format_errors = defaultdict(int)
-
-    for i, ex in enumerate(dataset):
-        if not isinstance(ex, dict):
-            format_errors["data_type"] += 1
-            continue
+        return _flatten_msgs(tuple(_msg_key(m) for m in data))
+
+# %% ../nbs/02_transform.ipynb 29
+def _flatten_chunk(chunk:List[Tuple[List[dict],dict]]) -> List[Tuple[str,str]]:
+    return [(RunData._flatten_data(i), RunData._flatten_data([o])) for i,o in chunk]
+
+def flatten_runs(items:Iterable, # `RunData` or `ChatRecord`s, like a `ChatRecordSet`
+                 n_workers:int=0, # number of processes, 0 flattens in this process
+                 chunk_size:int=1000 # number of runs sent to a process at a time
+                ) -> Tuple[List[str],List[str]]:
+    "The `flat_input` and `flat_output` of every item in `items`."
+    runs = [getattr(o, 'child_run', o) for o in items]
+    chunks = [[(r.inputs, r.output) for r in runs[i:i+chunk_size]] for i in range(0, len(runs), chunk_size)]
+    if n_workers and len(chunks) > 1:
+        with ProcessPoolExecutor(n_workers) as ex: res = [x for c in ex.map(_flatten_chunk, chunks) for x in c]
+    else: res = [x for c in chunks for x in _flatten_chunk(c)]
+    return [i for i,_ in res], [o for _,o in res]
 
-        messages = ex.get("messages", None)
-        if not messages:
-            format_errors["missing_messages_list"] += 1
+# %% ../nbs/02_transform.ipynb 32
+def _to_json(o):
+    "A json line for a `RunData`, or anything else with a `to_json` method, or a plain dict."
+    return o.to_json() if hasattr(o, 'to_json') else json.dumps(o)
+
+def _open_text(fname, mode='r'):
+    "Open `fname` as text, using gzip if it ends with `.gz`."
+    return gzip.open(fname, mode+'t', encoding='utf-8') if str(fname).endswith('.gz') else open(fname, mode, encoding='utf-8')
+
+class _ShuffleBuffer:
+    "Shuffle lines while holding at most `chunk_size` of them in memory, spilling shuffled chunks to `tmp_dir`."
+    def __init__(self, rng, chunk_size, tmp_dir): self.rng,self.chunk_size,self.tmp_dir,self.buf,self.chunks = rng,chunk_size,tmp_dir,[],[]
+
+    def add(self, line):
+        self.buf.append(line)
+        if len(self.buf) >= self.chunk_size: self._spill()
+
+    def _spill(self):
+        self.rng.shuffle(self.buf)
+        fd,path = tempfile.mkstemp(suffix='.jsonl', dir=self.tmp_dir)
+        with open(fd, 'w', encoding='utf-8') as f: f.writelines(self.buf)
+        self.chunks.append((path, len(self.buf)))
+        self.buf = []
+
+    def write_to(self, f):
+        "Write all lines to `f` in random order."
+        if not self.chunks:
+            self.rng.shuffle(self.buf)
+            return f.writelines(self.buf)
+        if self.buf: self._spill()
+        # Each chunk is already shuffled, so drawing the next line from a chunk with probability
+        # proportional to the lines it has left gives a uniform shuffle of the whole set.
+        files,left = [open(p, encoding='utf-8') for p,_ in self.chunks],[n for _,n in self.chunks]
+        try:
+            for _ in range(sum(left)):
+                i = self.rng.choices(range(len(left)), weights=left)[0]
+                f.write(files[i].readline())
+                left[i] -= 1
+        finally:
+            for o in files: o.close()
+
+def _valid_name(filename):
+    p = Path(filename)
+    return p.with_name(p.name.split('.')[0] + '_valid' + ''.join(p.suffixes))
+
+# %% ../nbs/02_transform.ipynb 33
+def write_to_jsonl(data_list:Iterable[RunData], # the data to be written, any iterable (e.g. a generator) works
+                   filename:str, # the output file, gzip compressed if it ends with `.gz`
+                   shuffle:bool=True, # shuffle the examples before writing them
+                   seed:int=None, # random seed for the shuffle and the validation split
+                   valid_pct:float=0., # fraction of examples written to a separate validation file
+                   valid_filename:str=None, # defaults to `filename` with a `_valid` suffix, e.g. `data_valid.jsonl`
+                   chunk_size:int=10_000, # max number of examples held in memory while shuffling
+                  ):
+    "Writes `data_list` to a .jsonl file in one streaming pass, optionally shuffled and split into train and validation files."
+    rng = random.Random(seed)
+    fnames = [filename] + ([valid_filename or _valid_name(filename)] if valid_pct else [])
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        outs = [_open_text(o, 'w') for o in fnames]
+        try:
+            sinks = [_ShuffleBuffer(rng, chunk_size, tmp_dir) for _ in outs] if shuffle else outs
+            for entry in data_list:
+                i = 1 if valid_pct and rng.random() < valid_pct else 0
+                (sinks[i].add if shuffle else sinks[i].write)(f"{_to_json(entry)}\n")
+            if shuffle:
+                for s,o in zip(sinks, outs): s.write_to(o)
+        finally:
+            for o in outs: o.close()
+
+# %% ../nbs/02_transform.ipynb 38
+_roles = ("system", "user", "assistant", "function")
+_msg_keys = ("role", "content", "name", "function_call")
+
+def _example_errors(ex) -> List[str]:
+    "The format errors in one fine-tuning example."
+    if not isinstance(ex, dict): return ["data_type"]
+    messages = ex.get("messages", None)
+    if not messages: return ["missing_messages_list"]
+    errs = []
+    for message in messages:
+        if not isinstance(message, dict):
+            errs.append("data_type")
             continue
+        if "role" not in message or ("content" not in message and 'function_call' not in message):
+            errs.append("message_missing_key")
+        if any(k not in _msg_keys for k in message): errs.append("message_unrecognized_key")
+        if message.get("role", None) not in _roles: errs.append("unrecognized_role")
+        content = message.get("content", None)
+        if (not content or not isinstance(content, str)) and 'function_call' not in message:
+            errs.append("missing_content")
+    if not any(isinstance(m, dict) and m.get("role", None) == "assistant" for m in messages):
+        errs.append("example_missing_assistant_message")
+    return errs
+
+@lru_cache(maxsize=None)
+def _encoding():
+    try: import tiktoken
+    except ImportError:
+        warnings.warn("tiktoken isn't installed, so tokens are estimated as 4 characters each. Install it with `pip install tiktoken` to count them exactly.")
+        return None
+    return tiktoken.get_encoding("cl100k_base")
+
+def _picklable(o) -> bool:
+    "Whether `o` can be sent to another process, which lambdas and closures can't."
+    try: pickle.dumps(o)
+    except Exception: return False
+    return True
+
+def _count_tokens(text:str) -> int:
+    "Tokens in `text` with tiktoken's `cl100k_base`, or an estimate of 4 characters per token if tiktoken isn't installed."
+    enc = _encoding()
+    return len(enc.encode(text)) if enc else -(-len(text)//4)
 
-        for im, message in enumerate(messages):
-            if "role" not in message or ("content" not in message and 'function_call' not in message):
-                format_errors["message_missing_key"] += 1
+def _example_tokens(ex:dict, count:Callable=_count_tokens) -> int:
+    "Tokens in a fine-tuning example: its messages, counted like the OpenAI cookbook does, plus its function definitions."
+    n = 3
+    for m in ex["messages"]:
+        n += 3
+        for k,v in m.items(): n += count(v if isinstance(v, str) else json.dumps(v)) + (k == "name")
+    if ex.get("functions"): n += count(json.dumps(ex["functions"]))
+    return n
 
-            if any(k not in ("role", "content", "name", "function_call") for k in message):
-                format_errors["message_unrecognized_key"] += 1
-                print(f'message_unrecognized_key {[k for k in message.keys() if k not in ["role", "content", "name"]]} in row:{i} message {im}')
+# %% ../nbs/02_transform.ipynb 39
+def _validate_range(fname, start, end, max_tokens, n_bad, count):
+    "Validate the lines of `fname` that start in the byte range [`start`, `end`), numbering rows from 0."
+    res = dict(n=0, errors=defaultdict(int), bad_rows=[], tokens=array('L'), too_long=[], n_too_long=0)
+    opener = gzip.open if str(fname).endswith('.gz') else open
+    with opener(fname, 'rb') as f:
+        if start:
+            f.seek(start-1)
+            f.readline() # skip to the first line that starts in this range
+        pos = f.tell()
+        while end is None or pos < end:
+            line = f.readline()
+            if not line: break
+            pos += len(line)
+            i = res['n']
+            res['n'] += 1
+            try: ex = json.loads(line)
+            except ValueError: errs = ["invalid_json"]
+            else: errs = _example_errors(ex)
+            for e in errs: res['errors'][e] += 1
+            if errs:
+                if len(res['bad_rows']) < n_bad: res['bad_rows'].append((i, sorted(set(errs))))
+                continue
+            n_toks = _example_tokens(ex, count)
+            res['tokens'].append(n_toks)
+            if n_toks > max_tokens:
+                res['n_too_long'] += 1
+                if len(res['too_long']) < n_bad: res['too_long'].append(i)
+    return res
 
-            if message.get("role", None) not in ("system", "user", "assistant", "function"):
-                format_errors["unrecognized_role"] += 1
-                print(f'unrecognized_role {message.get("role", None)} in row:{i} message {im}')
+def _token_stats(tokens) -> Dict[str,float]:
+    if not tokens: return {}
+    t = sorted(tokens)
+    pct = lambda q: t[int(q*(len(t)-1))]
+    return {'min':t[0], 'mean':round(sum(t)/len(t), 1), 'p50':pct(.5), 'p90':pct(.9), 'p99':pct(.99), 'max':t[-1]}
+
+# %% ../nbs/02_transform.ipynb 40
+class JsonlReport(BaseModel):
+    "The result of `validate_jsonl`."
+    fname:str
+    n_examples:int
+    errors:Dict[str,int] # number of format errors of each kind
+    bad_rows:List[Tuple[int,List[str]]] # the first rows with format errors, and their errors
+    token_stats:Dict[str,float] # distribution of tokens per valid example
+    max_tokens:int
+    n_too_long:int # number of examples over `max_tokens`
+    too_long:List[int] # the first rows over `max_tokens`
+
+    @property
+    def ok(self) -> bool:
+        "`True` if there are no format errors and no examples over the context limit."
+        return not self.errors and not self.n_too_long
 
-            content = message.get("content", None)
-            if (not content or not isinstance(content, str)) and 'function_call' not in message:
-                format_errors["missing_content"] += 1
-                print(f'missing_content in row:{i} message {im}')
+    def __repr__(self):
+        errs = ', '.join(f'{k}: {v}' for k,v in self.errors.items()) or 'none'
+        return (f'{self.n_examples} examples in {self.fname}\n'
+                f'Format errors: {errs}' + (f' (first rows: {[i for i,_ in self.bad_rows]})' if self.bad_rows else '') + '\n'
+                f'Tokens per example: {self.token_stats}\n'
+                f'Over {self.max_tokens} tokens: {self.n_too_long}' + (f' (first rows: {self.too_long})' if self.too_long else ''))
 
-        if not any(message.get("role", None) == "assistant" for message in messages):
-            format_errors["example_missing_assistant_message"] += 1
+# %% ../nbs/02_transform.ipynb 41
+def validate_jsonl(fname:str, # a fine-tuning `.jsonl` file, optionally gzip compressed
+                   max_tokens:int=4096, # the context limit examples are checked against
+                   n_bad:int=20, # the number of offending rows kept in the report
+                   n_workers:int=0, # number of processes, each validating a byte range of the file
+                   count_tokens:Callable=None, # counts the tokens in a string, defaults to tiktoken's `cl100k_base`; a lambda or closure can't be sent to other processes, so it is run serially
+                  ) -> JsonlReport:
+    "Validate `fname` line by line. Modified from https://cookbook.openai.com/examples/chat_finetuning_data_prep, but updated for function calling."
+    count = count_tokens or _count_tokens
+    size = os.path.getsize(fname)
+    if n_workers and size and not str(fname).endswith('.gz') and _picklable(count):
+        bounds = [size*i//n_workers for i in range(n_workers+1)]
+        with ProcessPoolExecutor(n_workers) as ex:
+            parts = list(ex.map(_validate_range, repeat(fname), bounds[:-1], bounds[1:], repeat(max_tokens), repeat(n_bad), repeat(count)))
+    else: parts = [_validate_range(fname, 0, None, max_tokens, n_bad, count)]
 
-    if format_errors:
-        print("Found errors:")
-        for k, v in format_errors.items():
-            print(f"{k}: {v}")
-    else:
-        print("No errors found")
+    n, errors, bad_rows, tokens, too_long, n_too_long = 0, defaultdict(int), [], array('L'), [], 0
+    for p in parts:
+        for k,v in p['errors'].items(): errors[k] += v
+        bad_rows += [(i+n, e) for i,e in p['bad_rows']]
+        too_long += [i+n for i in p['too_long']]
+        tokens.extend(p['tokens'])
+        n_too_long += p['n_too_long']
+        n += p['n']
+    return JsonlReport(fname=str(fname), n_examples=n, errors=dict(errors), bad_rows=bad_rows[:n_bad],
+                       token_stats=_token_stats(tokens), max_tokens=max_tokens, n_too_long=n_too_long, too_long=too_long[:n_bad])
@@ -1,14 +1,14 @@
 import os
 from shiny import App, ui, reactive, render
 import shiny.experimental as x
-from langfree.shiny import render_input_chat, render_llm_output
+from langfree.shiny import render_input_chat, render_llm_output, ReviewStore
 import pandas as pd
 
 
 FILENAME = "_data/sample_data.pkl"
-df = pd.read_pickle(FILENAME)
+reviews = ReviewStore("_data/reviews.db")
+df = reviews.apply(pd.read_pickle(FILENAME))
 n_rows = len(df)
-def save(df): df.to_pickle(FILENAME)
 
 status_styles = {'Accepted': 'bg-success', 'Rejected': 'bg-danger','Pending': 'bg-warning'}
 status_icons = {'Accepted': ui.HTML('<svg xmlns="http://www.w3.org/2000/svg" class="bi bi-check-lg" viewBox="0 0 16 16" style="height:auto;width:100%;fill:currentColor;" aria-hidden="true" role="img"><path d="M12.736 3.97a.733.733 0 0 1 1.047 0c.286.289.29.756.01 1.05L7.88 12.01a.733.733 0 0 1-1.065.02L3.217 8.384a.757.757 0 0 1 0-1.06.733.733 0 0 1 1.047 0l3.052 3.093 5.4-6.425a.247.247 0 0 1 .02-.022Z"/></svg>'), 
@@ -50,7 +50,7 @@ app_ui = ui.page_fluid(
 )
 
 def server(input, output, session):
-    cursor = reactive.Value(0)
+    cursor = reactive.Value(reviews.resume(df.child_run_id))
     status_trigger = reactive.Value(True)
 
     @reactive.Calc
@@ -93,7 +93,6 @@ def server(input, output, session):
     @reactive.event(input.reset)
     def reset():
         update_status('Pending')
-        save(df)
 
     @reactive.Effect
     @reactive.event(input.reject)
@@ -104,8 +103,8 @@ def server(input, output, session):
     @reactive.Effect
     @reactive.event(input.accept)
     def accept():
-        update_status('Accepted')
         current_row().child_run.output['content'] = input.llm_output()
+        update_status('Accepted', edited_output=input.llm_output())
         go_next()
 
     @reactive.Effect
@@ -122,12 +121,12 @@ def server(input, output, session):
         ui.modal_show(m)
 
     def go_next():
-        save(df)
         if cursor() + 1 < n_rows: cursor.set(cursor()+1)
         else: modal()
 
-    def update_status(status):
+    def update_status(status, edited_output=None):
         df.loc[cursor(), 'status'] = status
+        reviews.record(df.loc[cursor(), 'child_run_id'], status, edited_output)
         status_trigger.set(not status_trigger())
 
 abs_path = os.path.join(os.path.dirname(__file__), 'assets')